@@ -2,9 +2,19 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
-from datetime import datetime, timedelta
+import httpx
+import asyncio
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterable, Tuple, Sequence
+
+from parallel import (ColumnStats, ParallelExecutor, stats_kernel, histogram_kernel,
+                      comoment_kernel, merge_comoments)
 
 
 # Abstraction
@@ -21,44 +31,406 @@ class CSVDataSource(DataSource):
     def load_data(self) -> pd.DataFrame:
         return pd.read_csv(self.file_path)
 
+# Encapsulation
+class ResponseCache:
+    """In-memory HTTP response cache with TTL freshness and ETag revalidation."""
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[float, Optional[str], object]] = {}
+
+    def get_fresh(self, key: str) -> Optional[object]:
+        entry = self._entries.get(key)
+        if entry and time.monotonic() - entry[0] < self.ttl:
+            return entry[2]
+        return None
+
+    def etag(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        return entry[1] if entry else None
+
+    def store(self, key: str, etag: Optional[str], payload: object):
+        self._entries[key] = (time.monotonic(), etag, payload)
+
+    def revalidated(self, key: str) -> object:
+        # A 304 means our copy is still current, so restart its TTL
+        _, etag, payload = self._entries[key]
+        self.store(key, etag, payload)
+        return payload
+
+# Encapsulation
+class LRUCache:
+    """Bounded, thread-safe mapping that evicts the least recently used entry."""
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()  # One analyzer is shared by every session
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+# Encapsulation
+class _FrameBuilder:
+    """Turns pages into DataFrames as they arrive and stitches them back in page order."""
+
+    def __init__(self):
+        self._frames: Dict[int, pd.DataFrame] = {}
+
+    def add(self, page: int, records: List[Dict]):
+        if records:
+            self._frames[page] = pd.DataFrame.from_records(records)
+
+    def build(self) -> pd.DataFrame:
+        if not self._frames:
+            return pd.DataFrame()
+        return pd.concat([self._frames[page] for page in sorted(self._frames)], ignore_index=True)
+
 # Inheritance
 class APIDataSource(DataSource):
-    def __init__(self, api_url: str):
+    """Pages through a JSON API concurrently over one pooled async client."""
+
+    def __init__(self, api_url: str, page_size: int = 1000, concurrency: int = 8,
+                 timeout: float = 30.0, cache: Optional[ResponseCache] = None,
+                 headers: Optional[Dict[str, str]] = None, records_key: str = 'data',
+                 page_param: str = 'page', size_param: str = 'page_size'):
         self.api_url = api_url
+        self.page_size = page_size
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.cache = cache if cache is not None else ResponseCache()
+        self.headers = headers or {}
+        self.records_key = records_key
+        self.page_param = page_param
+        self.size_param = size_param
     
     def load_data(self) -> pd.DataFrame:
-        # Simulating API call
-        dates = pd.date_range(end=datetime.today(), periods=100).to_pydatetime().tolist()
+        return asyncio.run(self.load_data_async())
+
+    async def load_data_async(self) -> pd.DataFrame:
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        builder = _FrameBuilder()
+        async with httpx.AsyncClient(headers=self.headers, timeout=self.timeout, limits=limits) as client:
+            first = await self._fetch_page(client, semaphore, 1)
+            builder.add(1, self._records(first))
+            total_pages = self._total_pages(first)
+
+            if total_pages is not None:
+                # Parse each page as soon as it lands while the rest are still in flight
+                tasks = [self._fetch_page(client, semaphore, page, with_page=True) for page in range(2, total_pages + 1)]
+                for next_page in asyncio.as_completed(tasks):
+                    page, payload = await next_page
+                    builder.add(page, self._records(payload))
+            else:
+                # No total in the response: fetch in waves until a short page comes back
+                done = len(self._records(first)) < self.page_size
+                page = 2
+                while not done:
+                    wave = range(page, page + self.concurrency)
+                    payloads = await asyncio.gather(*(self._fetch_page(client, semaphore, p) for p in wave))
+                    for wave_page, payload in zip(wave, payloads):
+                        records = self._records(payload)
+                        builder.add(wave_page, records)
+                        done = done or len(records) < self.page_size
+                    page += self.concurrency
+        return builder.build()
+
+    async def _fetch_page(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore,
+                          page: int, with_page: bool = False):
+        url = httpx.URL(self.api_url).copy_merge_params({self.page_param: page, self.size_param: self.page_size})
+        key = str(url)
+        payload = self.cache.get_fresh(key)
+        if payload is None:
+            etag = self.cache.etag(key)
+            async with semaphore:
+                response = await client.get(url, headers={'If-None-Match': etag} if etag else None)
+            if response.status_code == 304:
+                payload = self.cache.revalidated(key)
+            else:
+                response.raise_for_status()
+                payload = response.json()
+                self.cache.store(key, response.headers.get('ETag'), payload)
+        return (page, payload) if with_page else payload
+
+    def _records(self, payload) -> List[Dict]:
+        if isinstance(payload, list):
+            return payload
+        return payload.get(self.records_key) or []
+
+    def _total_pages(self, payload) -> Optional[int]:
+        if not isinstance(payload, dict):
+            return None
+        if 'total_pages' in payload:
+            return int(payload['total_pages'])
+        if 'total' in payload:
+            return math.ceil(int(payload['total']) / self.page_size)
+        return None
+
+# Inheritance
+class SampleDataSource(DataSource):
+    """Random demo data for running the dashboard without an API."""
+
+    def __init__(self, periods: int = 100):
+        self.periods = periods
+
+    def load_data(self) -> pd.DataFrame:
+        dates = pd.date_range(end=datetime.today(), periods=self.periods).to_pydatetime().tolist()
         data = {
             'date': dates,
-            'value': np.random.randn(100).cumsum(),
-            'category': np.random.choice(['A', 'B', 'C'], 100)
+            'value': np.random.randn(self.periods).cumsum(),
+            'category': np.random.choice(['A', 'B', 'C'], self.periods)
         }
         return pd.DataFrame(data)
 
+# Encapsulation
+class StatisticsEngine:
+    """Builds summary statistics from mergeable per-chunk partial results."""
+
+    def __init__(self, sketch_size: int = 200, seed: Optional[int] = 0):
+        self.sketch_size = sketch_size
+        self.seed = seed
+
+    def partial(self, chunk: pd.DataFrame) -> Dict[str, ColumnStats]:
+        numeric_cols = chunk.select_dtypes(include=np.number).columns
+        return {
+            col: ColumnStats(self.sketch_size, self.seed).update(chunk[col].to_numpy())
+            for col in numeric_cols
+        }
+
+    def merge(self, partials: Iterable[Dict[str, ColumnStats]]) -> Dict[str, ColumnStats]:
+        merged: Dict[str, ColumnStats] = {}
+        for partial in partials:
+            for col, stats in partial.items():
+                if col not in merged:
+                    merged[col] = ColumnStats(self.sketch_size, self.seed)
+                merged[col].merge(stats)
+        return merged
+
+# Encapsulation
+class Rollup:
+    """Pre-aggregated time buckets and histograms so charts receive a bounded number of points."""
+
+    BUCKETS = [
+        ('min', pd.Timedelta(minutes=1)),
+        ('h', pd.Timedelta(hours=1)),
+        ('D', pd.Timedelta(days=1)),
+        ('W', pd.Timedelta(weeks=1)),
+        ('MS', pd.Timedelta(days=31))
+    ]
+
+    def __init__(self, data: pd.DataFrame, max_points: int = 2000, cache_size: int = 32):
+        self.data = data
+        self.max_points = max_points
+        self._cache = LRUCache(cache_size)
+        self._series_counts = LRUCache(cache_size)
+
+    def choose_bucket(self, start: pd.Timestamp, end: pd.Timestamp, series: int = 1) -> Tuple[str, pd.Timedelta]:
+        budget = max(1, self.max_points // max(1, series))
+        for freq, width in self.BUCKETS:
+            if (end - start) / width <= budget:
+                return freq, width
+        return self.BUCKETS[-1]
+
+    def _buckets(self, freq: str, y_column: str, category_column: Optional[str]) -> pd.DataFrame:
+        key = (freq, y_column, category_column)
+        buckets = self._cache.get(key)
+        if buckets is None:
+            keys = [pd.Grouper(key='date', freq=freq, closed='left', label='left')]
+            if category_column:
+                keys.append(category_column)
+            buckets = (
+                self.data.groupby(keys, observed=True)[y_column]
+                .agg(['sum', 'count', 'min', 'max'])
+                .reset_index()
+            )
+            self._cache.put(key, buckets)
+        return buckets
+
+    def _series(self, category_column: Optional[str]) -> int:
+        if not category_column:
+            return 1
+        count = self._series_counts.get(category_column)
+        if count is None:
+            count = int(self.data[category_column].nunique())
+            self._series_counts.put(category_column, count)
+        return max(1, count)
+
+    @staticmethod
+    def series_column(category_column: Optional[str]) -> Optional[str]:
+        # The time key is already the x axis; grouping by it again is not a category
+        return None if category_column == 'date' else category_column
+
+    def time_series(self, y_column: str, category_column: Optional[str] = None,
+                    start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> pd.DataFrame:
+        category_column = self.series_column(category_column)
+        start = pd.to_datetime(start_date) if start_date is not None else self.data['date'].min()
+        end = pd.to_datetime(end_date) if end_date is not None else self.data['date'].max()
+        freq, width = self.choose_bucket(start, end, self._series(category_column))
+
+        buckets = self._buckets(freq, y_column, category_column)
+        visible = buckets[(buckets['date'] + width > start) & (buckets['date'] <= end)]
+        visible = visible[visible['count'] > 0]
+        return visible.assign(**{y_column: visible['sum'] / visible['count']})
+
+    def category_summary(self, data: pd.DataFrame, y_column: str, category_column: str) -> pd.DataFrame:
+        return (
+            data.groupby(category_column, observed=True)[y_column]
+            .agg(['count', 'mean', 'min', 'max'])
+            .reset_index()
+        )
+
+    @staticmethod
+    def histogram(values: pd.Series, bins: int = 50) -> pd.DataFrame:
+        counts, edges = np.histogram(values.dropna().to_numpy(), bins=bins)
+        return Rollup.histogram_frame(counts, edges)
+
+    @staticmethod
+    def histogram_frame(counts: np.ndarray, edges: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame({
+            'bin_start': edges[:-1],
+            'bin_end': edges[1:],
+            'bin_center': (edges[:-1] + edges[1:]) / 2,
+            'count': counts
+        })
+
 # Encapsulation
 class DataAnalyzer:
-    def __init__(self, data_source: DataSource):
+    def __init__(self, data_source: DataSource, chunk_size: int = 50_000,
+                 parallel: Optional[ParallelExecutor] = None,
+                 summary_cache_size: int = 64, block_cache_size: int = 512):
         self.data = data_source.load_data()
         self._clean_data()  # private method for encapsulation
+        self.chunk_size = chunk_size
+        self._engine = StatisticsEngine()
+        self._numeric_cols = list(self.data.select_dtypes(include=np.number).columns)
+        self.parallel = parallel
+        if self.parallel is not None:
+            # Column-major so every column is one contiguous run in the shared buffer
+            self.parallel.load(np.ascontiguousarray(self.data[self._numeric_cols].to_numpy(np.float64).T))
+        self._block_stats = LRUCache(block_cache_size)
+        self._summary_cache = LRUCache(summary_cache_size)
+        self.rollup = Rollup(self.data) if 'date' in self.data.columns else None
     
+    def close(self):
+        if self.parallel is not None:
+            self.parallel.close()
+
     def _clean_data(self):
         if 'date' in self.data.columns:
             self.data['date'] = pd.to_datetime(self.data['date'])
             self.data = self.data.sort_values('date')
     
-    def get_summary_stats(self) -> Dict:
-        numeric_cols = self.data.select_dtypes(include=np.number).columns
+    def _row_range(self, start_date: Optional[datetime], end_date: Optional[datetime]) -> Tuple[int, int]:
+        if 'date' not in self.data.columns or start_date is None or end_date is None:
+            return 0, len(self.data)
+        dates = self.data['date'].to_numpy()
+        lo = int(np.searchsorted(dates, np.datetime64(pd.to_datetime(start_date)), side='left'))
+        hi = int(np.searchsorted(dates, np.datetime64(pd.to_datetime(end_date)), side='right'))
+        return lo, max(lo, hi)
+
+    def _partials(self, ranges: List[Tuple[int, int]]) -> List[Dict[str, ColumnStats]]:
+        if self.parallel is None:
+            return [self._engine.partial(self.data.iloc[lo:hi]) for lo, hi in ranges]
+
+        # Split by column as well when there are fewer row ranges than workers
+        columns = list(enumerate(self._numeric_cols))
+        groups = max(1, min(len(columns), self.parallel.workers // max(1, len(ranges))))
+        column_groups = [list(group) for group in np.array_split(np.arange(len(columns)), groups)]
+        tasks = [
+            (lo, hi, [columns[i] for i in group], self._engine.sketch_size, self._engine.seed)
+            for lo, hi in ranges
+            for group in column_groups
+        ]
+        results = self.parallel.map(stats_kernel, tasks)
+        return [
+            self._engine.merge(results[i * len(column_groups):(i + 1) * len(column_groups)])
+            for i in range(len(ranges))
+        ]
+
+    def get_summary_stats(self, start_date: Optional[datetime] = None,
+                          end_date: Optional[datetime] = None) -> Dict:
+        lo, hi = self._row_range(start_date, end_date)
+        cached = self._summary_cache.get((lo, hi))
+        if cached is not None:
+            return cached
+
+        # Whole blocks are reused across filters; only the edges are recomputed
+        first_full = -(-lo // self.chunk_size)
+        last_full = hi // self.chunk_size
+        if first_full < last_full:
+            blocks = range(first_full, last_full)
+            edges = [(lo, first_full * self.chunk_size), (last_full * self.chunk_size, hi)]
+        else:
+            blocks = range(0)
+            edges = [(lo, hi)]
+
+        block_stats = {block: self._block_stats.get(block) for block in blocks}
+        missing = [block for block, partial in block_stats.items() if partial is None]
+        ranges = edges + [(block * self.chunk_size, (block + 1) * self.chunk_size) for block in missing]
+        computed = self._partials(ranges)
+        for block, partial in zip(missing, computed[len(edges):]):
+            block_stats[block] = partial
+            self._block_stats.put(block, partial)
+
+        merged = self._engine.merge(computed[:len(edges)] + list(block_stats.values()))
+        stats = {col: merged[col].to_dict() for col in self.data.select_dtypes(include=np.number).columns}
+        self._summary_cache.put((lo, hi), stats)
+        return stats
+    
+    def get_distributions(self, bins: int = 50, start_date: Optional[datetime] = None,
+                          end_date: Optional[datetime] = None,
+                          columns: Optional[Sequence[str]] = None) -> Dict[str, pd.DataFrame]:
+        columns = list(self._numeric_cols if columns is None else columns)
+        lo, hi = self._row_range(start_date, end_date)
+        if self.parallel is None:
+            data = self.data.iloc[lo:hi]
+            return {col: Rollup.histogram(data[col], bins) for col in columns}
+
+        # Shared bin edges come from the (cached) min/max so worker counts can be summed
+        stats = self.get_summary_stats(start_date, end_date)
+        edges = [
+            (self._numeric_cols.index(col),
+             np.linspace(stats[col]['min'], stats[col]['max'], bins + 1)
+             if stats[col]['count'] else np.linspace(0, 1, bins + 1))
+            for col in columns
+        ]
+        results = self.parallel.map(histogram_kernel, [
+            (start, end, edges) for start, end in self.parallel.row_chunks(lo, hi)
+        ])
         return {
-            col: {
-                'mean': self.data[col].mean(),
-                'median': self.data[col].median(),
-                'min': self.data[col].min(),
-                'max': self.data[col].max()
-            }
-            for col in numeric_cols
+            col: Rollup.histogram_frame(sum(result[i] for result in results), edges[i][1])
+            for i, col in enumerate(columns)
         }
-    
+
+    def get_correlation_matrix(self, start_date: Optional[datetime] = None,
+                               end_date: Optional[datetime] = None) -> pd.DataFrame:
+        lo, hi = self._row_range(start_date, end_date)
+        if self.parallel is None:
+            return self.data.iloc[lo:hi][self._numeric_cols].dropna().corr()
+
+        _, _, comoment = merge_comoments(self.parallel.map(comoment_kernel, self.parallel.row_chunks(lo, hi)))
+        if comoment is None:
+            comoment = np.full((len(self._numeric_cols),) * 2, np.nan)
+        scale = np.sqrt(np.diag(comoment))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = comoment / np.outer(scale, scale)
+        return pd.DataFrame(corr, index=self._numeric_cols, columns=self._numeric_cols)
+
     def filter_by_date(self, start_date: datetime, end_date: datetime) -> pd.DataFrame:
         if 'date' not in self.data.columns:
             return self.data
@@ -66,26 +438,52 @@ class DataAnalyzer:
         end_date = pd.to_datetime(end_date)
         return self.data[(self.data['date'] >= start_date) & (self.data['date'] <= end_date)]
     
-    def plot_time_series(self, y_column: str, category_column: Optional[str] = None):
+    def plot_time_series(self, y_column: str, category_column: Optional[str] = None,
+                         start_date: Optional[datetime] = None, end_date: Optional[datetime] = None):
         if 'date' not in self.data.columns:
             st.warning("No date column found for time series plot")
             return
         
+        # Plot bucket means rather than raw rows; bucket size follows the visible range
+        series = self.rollup.time_series(y_column, category_column, start_date, end_date)
         fig = px.line(
-            self.data, 
+            series, 
             x='date', 
             y=y_column,
-            color=category_column,
+            color=Rollup.series_column(category_column),
             title=f"Time Series of {y_column}"
         )
         st.plotly_chart(fig)
     
-    def plot_distribution(self, column: str):
-        fig = px.histogram(
-            self.data,
-            x=column,
+    def plot_distribution(self, column: str, start_date: Optional[datetime] = None,
+                          end_date: Optional[datetime] = None, bins: int = 50):
+        # Bin on the server and send only the counts to the browser
+        histogram = self.get_distributions(bins, start_date, end_date, [column])[column]
+        fig = px.bar(
+            histogram,
+            x='bin_center',
+            y='count',
+            hover_data=['bin_start', 'bin_end'],
+            labels={'bin_center': column},
             title=f"Distribution of {column}"
         )
+        fig.update_layout(bargap=0)
+        st.plotly_chart(fig)
+
+    def plot_correlation(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None):
+        corr = self.get_correlation_matrix(start_date, end_date)
+        fig = px.imshow(corr, text_auto='.2f', zmin=-1, zmax=1, title="Correlation Matrix")
+        st.plotly_chart(fig)
+
+    def plot_category_summary(self, data: pd.DataFrame, y_column: str, category_column: str):
+        summary = self.rollup.category_summary(data, y_column, category_column)
+        fig = px.bar(
+            summary,
+            x=category_column,
+            y='mean',
+            hover_data=['count', 'min', 'max'],
+            title=f"Mean {y_column} by {category_column}"
+        )
         st.plotly_chart(fig)
 
 # Encapsulation
@@ -96,8 +494,6 @@ class Dashboard:
     def render(self):
         st.title("Advanced Data Analysis Dashboard")
         
-        # Sidebar controls
-        st.sidebar.header("Controls")
         show_summary = st.sidebar.checkbox("Show Summary Statistics", True)
         
         if 'date' in self.analyzer.data.columns:
@@ -111,16 +507,19 @@ class Dashboard:
             )
             
             if len(date_range) == 2:
-                filtered_data = self.analyzer.filter_by_date(date_range[0], date_range[1])
+                start_date, end_date = date_range
+                filtered_data = self.analyzer.filter_by_date(start_date, end_date)
             else:
+                start_date = end_date = None
                 filtered_data = self.analyzer.data
         else:
+            start_date = end_date = None
             filtered_data = self.analyzer.data
         
         # Main content
         if show_summary:
             st.header("Summary Statistics")
-            stats = self.analyzer.get_summary_stats()
+            stats = self.analyzer.get_summary_stats(start_date, end_date)
             for col, values in stats.items():
                 st.subheader(col)
                 cols = st.columns(4)
@@ -136,26 +535,66 @@ class Dashboard:
             selected_column = st.selectbox("Select column for visualization", numeric_cols)
             
             if 'date' in filtered_data.columns:
-                category_cols = [None] + list(filtered_data.select_dtypes(exclude=np.number).columns)
+                category_cols = [None] + [
+                    col for col in filtered_data.select_dtypes(exclude=[np.number, 'datetime', 'datetimetz']).columns
+                    if col != 'date'
+                ]
                 selected_category = st.selectbox("Select category (optional)", category_cols)
                 
-                tab1, tab2 = st.tabs(["Time Series", "Distribution"])
+                tab1, tab2, tab3, tab4 = st.tabs(["Time Series", "Distribution", "By Category", "Correlation"])
                 
                 with tab1:
-                    self.analyzer.plot_time_series(selected_column, selected_category)
+                    self.analyzer.plot_time_series(selected_column, selected_category, start_date, end_date)
                 
                 with tab2:
-                    self.analyzer.plot_distribution(selected_column)
+                    self.analyzer.plot_distribution(selected_column, start_date, end_date)
+
+                with tab3:
+                    if selected_category:
+                        self.analyzer.plot_category_summary(filtered_data, selected_column, selected_category)
+                    else:
+                        st.info("Select a category to see per-category aggregates")
+
+                with tab4:
+                    self.analyzer.plot_correlation(start_date, end_date)
             else:
                 self.analyzer.plot_distribution(selected_column)
         
         st.header("Raw Data")
-        st.dataframe(filtered_data)
+        self._render_raw_data(filtered_data)
+
+    def _render_raw_data(self, data: pd.DataFrame, page_size: int = 100):
+        # Only the current page is sent to the browser
+        pages = max(1, -(-len(data) // page_size))
+        page = st.number_input("Page", min_value=1, max_value=pages, value=1, step=1)
+        start = (int(page) - 1) * page_size
+        st.caption(f"Rows {start + 1}-{min(start + page_size, len(data))} of {len(data)}")
+        st.dataframe(data.iloc[start:start + page_size])
+
+@st.cache_resource
+def load_source(api_url: Optional[str]) -> DataSource:
+    # Outlives the analyzer, so a reload revalidates cached pages by ETag instead of refetching them
+    return APIDataSource(api_url, cache=ResponseCache()) if api_url else SampleDataSource()
+
+@st.cache_resource(show_spinner="Loading data...", on_release=DataAnalyzer.close)
+def load_analyzer(api_url: Optional[str], workers: int = 0) -> DataAnalyzer:
+    # Built once per process so the data and stats caches survive reruns; cleared by "Reload data"
+    parallel = ParallelExecutor(workers) if workers > 0 else None
+    return DataAnalyzer(load_source(api_url), parallel=parallel)
 
 # Polymorphism
-# Different data sources (CSVDataSource, APIDataSource) use same `load_data()` method differently
+# Different data sources (CSVDataSource, APIDataSource, SampleDataSource) use same `load_data()` method differently
 if __name__ == "__main__":
-    data_source = APIDataSource("https://api.example.com/data")
-    analyzer = DataAnalyzer(data_source)
+    # Sidebar controls
+    st.sidebar.header("Controls")
+    use_parallel = st.sidebar.toggle(
+        "Parallel workers",
+        value=os.environ.get("ANALYSIS_PARALLEL", "0") == "1",
+        help="Compute statistics in worker processes; pays off from a few million rows"
+    )
+    workers = int(os.environ.get("ANALYSIS_WORKERS", "0")) or os.cpu_count() or 1
+    if st.sidebar.button("Reload data", help="Fetch the data again; fresh pages and pages the API reports unchanged are reused"):
+        load_analyzer.clear()
+    analyzer = load_analyzer(os.environ.get("DATA_API_URL"), workers if use_parallel else 0)
     dashboard = Dashboard(analyzer)
     dashboard.render()
@@ -0,0 +1,266 @@
+"""Statistics partials, worker kernels and the process pool for the analysis dashboard.
+
+``streamlit run`` executes main.py as a synthetic ``__main__`` that worker
+processes cannot import, so everything sent to or returned from a worker lives here.
+"""
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Dict, Optional, Iterable, Tuple, Callable, Sequence
+
+import numpy as np
+
+
+# Encapsulation
+class RunningMoments:
+    """Mergeable count/mean/variance/min/max accumulator (Chan et al. update)."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = np.nan
+        self.max = np.nan
+
+    def update(self, values: np.ndarray):
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return
+        other = RunningMoments()
+        other.count = values.size
+        other.mean = float(values.mean())
+        other._m2 = float(((values - other.mean) ** 2).sum())
+        other.min = float(values.min())
+        other.max = float(values.max())
+        self.merge(other)
+
+    def merge(self, other: "RunningMoments"):
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self._m2 = other.count, other.mean, other._m2
+            self.min, self.max = other.min, other.max
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self._m2 += other._m2 + delta ** 2 * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.count - 1) if self.count > 1 else np.nan
+
+
+# Encapsulation
+class QuantileSketch:
+    """Mergeable KLL-style quantile sketch with memory bounded by ``k``."""
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None):
+        self.k = k
+        self.count = 0
+        self._levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            if items.size > self._capacity(level):
+                if level + 1 == len(self._levels):
+                    self._levels.append(np.empty(0))
+                items = np.sort(items)
+                odd = items.size % 2
+                # Each survivor of a compaction stands in for two items one level down
+                survivors = items[:items.size - odd][self._rng.integers(2)::2]
+                self._levels[level + 1] = np.concatenate([self._levels[level + 1], survivors])
+                self._levels[level] = items[items.size - odd:]
+            level += 1
+
+    def update(self, values: np.ndarray):
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return
+        self.count += values.size
+        self._levels[0] = np.concatenate([self._levels[0], values.astype(float)])
+        self._compress()
+
+    def merge(self, other: "QuantileSketch"):
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0))
+        for level, items in enumerate(other._levels):
+            self._levels[level] = np.concatenate([self._levels[level], items])
+        self.count += other.count
+        self._compress()
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return np.nan
+        if len(self._levels) == 1:
+            # Nothing has been compacted yet, so the answer is exact
+            return float(np.quantile(self._levels[0], q))
+        items = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(level.size, 2 ** i) for i, level in enumerate(self._levels)])
+        order = np.argsort(items)
+        cumulative = np.cumsum(weights[order])
+        index = np.searchsorted(cumulative, q * cumulative[-1])
+        return float(items[order][min(index, items.size - 1)])
+
+
+# Encapsulation
+class ColumnStats:
+    """Partial statistics for one column; partials from any chunk can be merged."""
+
+    def __init__(self, sketch_size: int = 200, seed: Optional[int] = None):
+        self.moments = RunningMoments()
+        self.sketch = QuantileSketch(sketch_size, seed)
+
+    def update(self, values) -> "ColumnStats":
+        values = np.asarray(values, dtype=float)
+        self.moments.update(values)
+        self.sketch.update(values)
+        return self
+
+    def merge(self, other: "ColumnStats") -> "ColumnStats":
+        self.moments.merge(other.moments)
+        self.sketch.merge(other.sketch)
+        return self
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.moments.count,
+            'mean': self.moments.mean if self.moments.count else np.nan,
+            'std': float(np.sqrt(self.moments.variance)),
+            'min': self.moments.min,
+            'p25': self.sketch.quantile(0.25),
+            'median': self.sketch.quantile(0.5),
+            'p75': self.sketch.quantile(0.75),
+            'max': self.moments.max
+        }
+
+
+# Worker kernels run on a (columns x rows) float matrix
+def stats_kernel(matrix: np.ndarray, lo: int, hi: int, columns: Sequence[Tuple[int, str]],
+                  sketch_size: int, seed: Optional[int]) -> Dict[str, ColumnStats]:
+    return {
+        name: ColumnStats(sketch_size, seed).update(matrix[index, lo:hi])
+        for index, name in columns
+    }
+
+
+def histogram_kernel(matrix: np.ndarray, lo: int, hi: int,
+                     edges: Sequence[Tuple[int, np.ndarray]]) -> List[np.ndarray]:
+    counts = []
+    for index, column_edges in edges:
+        values = matrix[index, lo:hi]
+        counts.append(np.histogram(values[~np.isnan(values)], bins=column_edges)[0])
+    return counts
+
+
+def comoment_kernel(matrix: np.ndarray, lo: int, hi: int) -> Tuple[int, np.ndarray, np.ndarray]:
+    block = matrix[:, lo:hi]
+    block = block[:, ~np.isnan(block).any(axis=0)]
+    if block.shape[1] == 0:
+        return 0, np.zeros(matrix.shape[0]), np.zeros((matrix.shape[0], matrix.shape[0]))
+    mean = block.mean(axis=1)
+    centered = block - mean[:, None]
+    return block.shape[1], mean, centered @ centered.T
+
+
+def merge_comoments(parts: Iterable[Tuple[int, np.ndarray, np.ndarray]]) -> Tuple[int, np.ndarray, np.ndarray]:
+    count, mean, comoment = 0, None, None
+    for part_count, part_mean, part_comoment in parts:
+        if part_count == 0:
+            continue
+        if count == 0:
+            count, mean, comoment = part_count, part_mean, part_comoment
+            continue
+        total = count + part_count
+        delta = part_mean - mean
+        mean = mean + delta * part_count / total
+        comoment = comoment + part_comoment + np.outer(delta, delta) * count * part_count / total
+        count = total
+    return count, mean, comoment
+
+
+def run_on_shared(name: str, shape: Tuple[int, int], kernel: Callable, *args):
+    # Attach to the parent's buffer instead of receiving the data pickled
+    shm = shared_memory.SharedMemory(name=name, track=False)
+    try:
+        matrix = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        result = kernel(matrix, *args)
+        del matrix
+        return result
+    finally:
+        shm.close()
+
+
+# Encapsulation
+class ParallelExecutor:
+    """Runs analysis kernels over a shared-memory copy of the numeric columns in worker processes."""
+
+    def __init__(self, workers: Optional[int] = None, min_rows_per_task: int = 100_000):
+        self.workers = workers or os.cpu_count() or 1
+        self.min_rows_per_task = min_rows_per_task
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._shape: Tuple[int, int] = (0, 0)
+        self._lock = threading.Lock()
+        # Make sure the shared buffer is unlinked even if nobody calls close()
+        atexit.register(self.close)
+
+    def load(self, matrix: np.ndarray):
+        with self._lock:
+            self._release_buffer()
+            self._shm = shared_memory.SharedMemory(create=True, size=max(1, matrix.nbytes))
+            shared = np.ndarray(matrix.shape, dtype=np.float64, buffer=self._shm.buf)
+            shared[:] = matrix
+            del shared
+            self._shape = matrix.shape
+
+    def row_chunks(self, lo: int, hi: int) -> List[Tuple[int, int]]:
+        tasks = max(1, min(self.workers * 4, (hi - lo) // self.min_rows_per_task))
+        bounds = np.linspace(lo, hi, tasks + 1, dtype=int)
+        return [(int(start), int(end)) for start, end in zip(bounds[:-1], bounds[1:])]
+
+    def map(self, kernel: Callable, tasks: Iterable[Tuple]) -> List:
+        if self._shm is None:
+            raise RuntimeError("No data loaded into the parallel executor")
+        with self._lock:
+            if self._pool is None:
+                # Spawn rather than fork: the Streamlit server process is multi-threaded
+                self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+        futures = [
+            self._pool.submit(run_on_shared, self._shm.name, self._shape, kernel, *task)
+            for task in tasks
+        ]
+        return [future.result() for future in futures]
+
+    def _release_buffer(self):
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def close(self):
+        atexit.unregister(self.close)
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+            self._release_buffer()
+
+    def __enter__(self) -> "ParallelExecutor":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,84 @@
+import importlib.util
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+HERE = Path(__file__).parent
+spec = importlib.util.spec_from_file_location("analysis_main", HERE / "main.py")
+analysis = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(analysis)
+
+ROWS = [{'id': i, 'value': i * 1.5, 'category': 'ABC'[i % 3]} for i in range(95)]
+
+
+# Local stand-in for the data API: pages ROWS, tags every page with an ETag and honours If-None-Match
+class StandInAPI(BaseHTTPRequestHandler):
+    with_total = True
+    requests = []
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        page, size = int(query['page'][0]), int(query['page_size'][0])
+        etag = f'"{page}-{size}"'
+        self.requests.append((page, self.headers.get('If-None-Match')))
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        payload = {'data': ROWS[(page - 1) * size:page * size]}
+        if self.with_total:
+            payload['total'] = len(ROWS)
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(params=[True, False], ids=['total', 'waves'])
+def api(request):
+    handler = type('Handler', (StandInAPI,), {'with_total': request.param, 'requests': []})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/items", handler.requests
+    server.shutdown()
+    server.server_close()
+
+
+def test_pages_are_fetched_and_kept_in_order(api):
+    url, requests = api
+    source = analysis.APIDataSource(url, page_size=10, concurrency=4)
+    data = source.load_data()
+    assert data['id'].tolist() == list(range(len(ROWS)))
+    assert sorted(page for page, _ in requests)[:10] == list(range(1, 11))
+
+
+def test_fresh_pages_are_served_from_the_cache(api):
+    url, requests = api
+    source = analysis.APIDataSource(url, page_size=10, cache=analysis.ResponseCache(ttl=300))
+    source.load_data()
+    sent = len(requests)
+    assert source.load_data()['id'].tolist() == list(range(len(ROWS)))
+    assert len(requests) == sent
+
+
+def test_stale_pages_are_revalidated_with_etags(api):
+    url, requests = api
+    source = analysis.APIDataSource(url, page_size=10, cache=analysis.ResponseCache(ttl=0))
+    first = source.load_data()
+    sent = len(requests)
+    second = source.load_data()
+    revalidations = requests[sent:]
+    assert revalidations and all(etag for _, etag in revalidations)
+    assert second.equals(first)
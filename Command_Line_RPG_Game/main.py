@@ -1,7 +1,18 @@
+import argparse
+import json
+import os
 import random
+import struct
 from abc import ABC, abstractmethod
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from enum import Enum, auto
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+try:
+    import numpy as np  # Only needed for the batch simulator
+except ImportError:
+    np = None
 
 # Abstraction: Enum simplifies character class handling
 class CharacterClass(Enum):
@@ -9,16 +20,29 @@ class CharacterClass(Enum):
     MAGE = auto()
     ROGUE = auto()
 
-@dataclass
+@dataclass(slots=True)
 class Weapon:
     name: str
     damage: int
     durability: int
 
+# Used as the output function when running headless simulations
+def quiet(message: str):
+    pass
+
 # Abstraction + Inheritance: Base abstract class for all character types
 class Character(ABC):  # Abstraction
-    def __init__(self, name: str, character_class: CharacterClass):
+    # Chance and damage range of a class's bonus hit after each attack (none by default)
+    proc_chance = 0.0
+    proc_damage = (0, 0)
+    # Slots keep characters small when simulations create millions of them
+    __slots__ = ("rng", "log", "name", "character_class", "level", "health", "weapon", "inventory")
+
+    def __init__(self, name: str, character_class: CharacterClass, rng=random, log=print):
         # Encapsulation: All character-related properties are bundled inside the class
+        # rng and log are injectable so fights can run seeded and silently
+        self.rng = rng
+        self.log = log
         self.name = name
         self.character_class = character_class
         self.level = 1
@@ -31,29 +55,31 @@ class Character(ABC):  # Abstraction
     def _initialize_class(self):
         pass
 
-    def attack(self, target):
+    # Returns the damage dealt so simulations can record it
+    def attack(self, target) -> int:
         if not self.weapon:
-            print(f"{self.name} has no weapon to attack with!")
-            return
+            self.log(f"{self.name} has no weapon to attack with!")
+            return 0
 
-        damage = random.randint(self.weapon.damage // 2, self.weapon.damage)
+        damage = self.rng.randint(self.weapon.damage // 2, self.weapon.damage)
         target.health -= damage
         self.weapon.durability -= 1
 
-        print(f"{self.name} attacks {target.name} with {self.weapon.name} for {damage} damage!")
+        self.log(f"{self.name} attacks {target.name} with {self.weapon.name} for {damage} damage!")
 
         if self.weapon.durability <= 0:
-            print(f"{self.name}'s {self.weapon.name} broke!")
+            self.log(f"{self.name}'s {self.weapon.name} broke!")
             self.weapon = None
+        return damage
 
     def equip_weapon(self, weapon: Weapon):
         self.weapon = weapon
-        print(f"{self.name} equipped {weapon.name}!")
+        self.log(f"{self.name} equipped {weapon.name}!")
 
     def level_up(self):
         self.level += 1
         self.health += 20
-        print(f"{self.name} leveled up to level {self.level}!")
+        self.log(f"{self.name} leveled up to level {self.level}!")
 
     def is_alive(self):
         return self.health > 0
@@ -61,43 +87,157 @@ class Character(ABC):  # Abstraction
 # Inheritance: Warrior inherits from Character
 # Polymorphism: Overrides _initialize_class to customize Warrior
 class Warrior(Character):  # Inheritance
+    __slots__ = ()
     def _initialize_class(self):  # Polymorphism
         self.health = 120
         self.equip_weapon(Weapon("Rusty Sword", 15, 10))
 
 # Inheritance + Polymorphism: Mage inherits and modifies attack behavior
 class Mage(Character):  # Inheritance
+    __slots__ = ()
+    proc_chance = 0.3
+    proc_damage = (5, 15)
+
     def _initialize_class(self):  # Polymorphism
         self.health = 80
         self.equip_weapon(Weapon("Wooden Staff", 20, 5))
 
-    def attack(self, target):  # Polymorphism
-        super().attack(target)
-        if random.random() < 0.3:
-            magic_damage = random.randint(5, 15)
+    def attack(self, target) -> int:  # Polymorphism
+        damage = super().attack(target)
+        if self.rng.random() < self.proc_chance:
+            magic_damage = self.rng.randint(*self.proc_damage)
             target.health -= magic_damage
-            print(f"Magic burst hits {target.name} for additional {magic_damage} damage!")
+            damage += magic_damage
+            self.log(f"Magic burst hits {target.name} for additional {magic_damage} damage!")
+        return damage
 
 # Inheritance + Polymorphism: Rogue inherits and defines its unique attack
 class Rogue(Character):  # Inheritance
+    __slots__ = ()
+    proc_chance = 0.4
+    proc_damage = (10, 20)
+
     def _initialize_class(self):  # Polymorphism
         self.health = 90
         self.equip_weapon(Weapon("Dagger", 12, 15))
 
-    def attack(self, target):  # Polymorphism
-        super().attack(target)
-        if random.random() < 0.4:
-            crit_damage = random.randint(10, 20)
+    def attack(self, target) -> int:  # Polymorphism
+        damage = super().attack(target)
+        if self.rng.random() < self.proc_chance:
+            crit_damage = self.rng.randint(*self.proc_damage)
             target.health -= crit_damage
-            print(f"Critical strike! {target.name} takes extra {crit_damage} damage!")
+            damage += crit_damage
+            self.log(f"Critical strike! {target.name} takes extra {crit_damage} damage!")
+        return damage
+
+# Polymorphism: Maps each CharacterClass to the subclass that implements it
+CLASS_TYPES = {
+    CharacterClass.WARRIOR: Warrior,
+    CharacterClass.MAGE: Mage,
+    CharacterClass.ROGUE: Rogue,
+}
+
+# Data-driven enemy roster: each kind can appear with any character class
+ENEMY_KINDS = ["Goblin", "Orc", "Skeleton", "Zombie"]
+
+@dataclass(frozen=True, slots=True)
+class EnemyTemplate:
+    name: str
+    character_class: CharacterClass
+    health: int
+    weapon: Weapon  # Prototype only; every enemy gets its own copy
+
+# Abstraction: Base stats for every (kind, class) pair, read once from the real classes
+class EnemyRegistry:
+    _templates = None
+
+    @classmethod
+    def templates(cls) -> dict:
+        if cls._templates is None:
+            cls._templates = {}
+            for char_class, character_type in CLASS_TYPES.items():
+                sample = character_type("template", char_class, log=quiet)
+                for kind in ENEMY_KINDS:
+                    name = f"{kind} {char_class.name.title()}"
+                    cls._templates[kind, char_class] = EnemyTemplate(name, char_class, sample.health, sample.weapon)
+        return cls._templates
+
+    @classmethod
+    def get(cls, kind: str, char_class: CharacterClass) -> EnemyTemplate:
+        return cls.templates()[kind, char_class]
+
+# Encapsulation: Per-floor stat bonuses, precomputed and grown on demand for deep runs
+class ScalingTable:
+    def __init__(self, health_per_floor: int = 10):
+        self.health_per_floor = health_per_floor
+        self._health = [0, 0]  # Index by floor; floor 1 has no bonus
+
+    def _grow(self, floor: int):
+        size = max(floor + 1, 2 * len(self._health))
+        self._health.extend((f - 1) * self.health_per_floor for f in range(len(self._health), size))
+
+    def health_bonus(self, floor: int) -> int:
+        if floor >= len(self._health):
+            self._grow(floor)
+        return self._health[floor]
+
+    def health_bonuses(self, max_floor: int) -> list:
+        self.health_bonus(max_floor)
+        return self._health
+
+# Encapsulation: Recycles defeated enemies so deep or crowded runs don't allocate new objects every floor
+class EnemyPool:
+    def __init__(self, rng=random, log=print):
+        self.rng = rng
+        self.log = log
+        self._free = {char_class: [] for char_class in CharacterClass}
+
+    def acquire(self, template: EnemyTemplate, level: int, health: int) -> Character:
+        free = self._free[template.character_class]
+        if free:
+            enemy = free.pop()
+        else:
+            character_type = CLASS_TYPES[template.character_class]
+            enemy = character_type.__new__(character_type)  # Skip __init__: the template already has the stats
+            enemy.rng, enemy.log = self.rng, self.log
+            enemy.character_class = template.character_class
+            enemy.weapon = None
+            enemy.inventory = []
+        enemy.name = template.name
+        enemy.level = level
+        enemy.health = health
+        prototype = template.weapon
+        if enemy.weapon is None:
+            enemy.weapon = Weapon(prototype.name, prototype.damage, prototype.durability)
+        else:
+            enemy.weapon.name, enemy.weapon.damage = prototype.name, prototype.damage
+            enemy.weapon.durability = prototype.durability
+        enemy.inventory.clear()
+        return enemy
+
+    def release(self, enemies):
+        for enemy in enemies:
+            self._free[enemy.character_class].append(enemy)
 
 # Encapsulation: Game logic wrapped in a class to manage state and flow
 class Game:
-    def __init__(self):
+    def __init__(self, rng=random, log=print, floor_size: int = 3, scaling: ScalingTable = None):
+        self.rng = rng
+        self.log = log
+        self.floor_size = floor_size
+        self.scaling = scaling or ScalingTable()
+        self.pool = EnemyPool(rng, log)
         self.player = None
         self.enemies = []
         self.current_floor = 1
         self.game_over = False
+        self.turns = 0
+        self.autosave = None  # Optional Autosaver, ticked after every turn
+
+    def create_player(self, name: str, char_class: CharacterClass):
+        # Polymorphism: Using same type (Character) to refer to different class instances
+        self.player = CLASS_TYPES[char_class](name, char_class, self.rng, self.log)
+        self._generate_enemies()
 
     def start_game(self):
         print("Welcome to Python RPG!")
@@ -109,33 +249,60 @@ class Game:
         class_choice = int(input("Select class (1-3): ")) - 1
         char_class = list(CharacterClass)[class_choice]
 
-        # Polymorphism: Using same type (Character) to refer to different class instances
-        if char_class == CharacterClass.WARRIOR:
-            self.player = Warrior(name, char_class)
-        elif char_class == CharacterClass.MAGE:
-            self.player = Mage(name, char_class)
-        else:
-            self.player = Rogue(name, char_class)
-
-        self._generate_enemies()
+        self.create_player(name, char_class)
         self._game_loop()
 
     def _generate_enemies(self):
-        enemy_classes = ["Goblin", "Orc", "Skeleton", "Zombie"]
-        for i in range(3):
-            enemy_type = random.choice(enemy_classes)
-            enemy_class = random.choice(list(CharacterClass))
-
-            if enemy_class == CharacterClass.WARRIOR:
-                enemy = Warrior(f"{enemy_type} Warrior", enemy_class)
-            elif enemy_class == CharacterClass.MAGE:
-                enemy = Mage(f"{enemy_type} Mage", enemy_class)
+        classes = list(CharacterClass)
+        bonus = self.scaling.health_bonus(self.current_floor)
+        for i in range(self.floor_size):
+            template = EnemyRegistry.get(self.rng.choice(ENEMY_KINDS), self.rng.choice(classes))
+            self.enemies.append(self.pool.acquire(template, self.current_floor, template.health + bonus))
+
+    def next_floor(self):
+        self.log("No enemies remaining! Moving to next floor...")
+        self.current_floor += 1
+        self._generate_enemies()
+        self.player.level_up()
+
+    def _enemies_attack(self) -> int:
+        taken = 0
+        for enemy in self.enemies:
+            taken += enemy.attack(self.player)
+            if not self.player.is_alive():
+                self.log("Game Over! You were defeated.")
+                self.game_over = True
+                break
+        return taken
+
+    # One combat turn, shared by the interactive loop and headless simulations.
+    # Returns (damage dealt by the player, damage taken by the player).
+    def take_turn(self, action: str, target: int = 0):
+        dealt = taken = 0
+        if action == "attack":
+            if 0 <= target < len(self.enemies):
+                dealt = self.player.attack(self.enemies[target])
+
+                if not self.enemies[target].is_alive():
+                    self.log(f"{self.enemies[target].name} was defeated!")
+                    self.pool.release([self.enemies.pop(target)])
+
+                taken = self._enemies_attack()
             else:
-                enemy = Rogue(f"{enemy_type} Rogue", enemy_class)
+                self.log("Invalid enemy selection!")
 
-            enemy.level = self.current_floor
-            enemy.health += (self.current_floor - 1) * 10
-            self.enemies.append(enemy)
+        elif action == "flee":
+            if self.rng.random() < 0.5:
+                self.log("You successfully fled from battle!")
+                self.pool.release(self.enemies)
+                self.enemies.clear()
+            else:
+                self.log("Failed to flee! Enemies attack!")
+                taken = self._enemies_attack()
+        self.turns += 1
+        if self.autosave:
+            self.autosave.tick(self)
+        return dealt, taken
 
     def _game_loop(self):
         while not self.game_over and self.player.is_alive():
@@ -143,10 +310,7 @@ class Game:
             print(f"{self.player.name} (Level {self.player.level}) - HP: {self.player.health}")
 
             if not self.enemies:
-                print("No enemies remaining! Moving to next floor...")
-                self.current_floor += 1
-                self._generate_enemies()
-                self.player.level_up()
+                self.next_floor()
                 continue
 
             print("\nEnemies:")
@@ -157,26 +321,13 @@ class Game:
             print("1. Attack")
             print("2. Check Inventory")
             print("3. Flee (50% chance)")
+            print("4. Save & Quit")
 
             choice = input("Choose action: ")
 
             if choice == "1":
-                enemy_choice = int(input("Select enemy to attack (1-3): ")) - 1
-                if 0 <= enemy_choice < len(self.enemies):
-                    self.player.attack(self.enemies[enemy_choice])
-
-                    if not self.enemies[enemy_choice].is_alive():
-                        print(f"{self.enemies[enemy_choice].name} was defeated!")
-                        self.enemies.pop(enemy_choice)
-
-                    for enemy in self.enemies:
-                        enemy.attack(self.player)
-                        if not self.player.is_alive():
-                            print("Game Over! You were defeated.")
-                            self.game_over = True
-                            break
-                else:
-                    print("Invalid enemy selection!")
+                enemy_choice = int(input(f"Select enemy to attack (1-{len(self.enemies)}): ")) - 1
+                self.take_turn("attack", enemy_choice)
 
             elif choice == "2":
                 print("\nInventory:")
@@ -186,21 +337,570 @@ class Game:
                     print("No weapon equipped!")
 
             elif choice == "3":
-                if random.random() < 0.5:
-                    print("You successfully fled from battle!")
-                    self.enemies.clear()
-                else:
-                    print("Failed to flee! Enemies attack!")
-                    for enemy in self.enemies:
-                        enemy.attack(self.player)
-                        if not self.player.is_alive():
-                            print("Game Over! You were defeated.")
-                            self.game_over = True
-                            break
+                self.take_turn("flee")
+
+            elif choice == "4":
+                if self.autosave:
+                    self.autosave.save_now(self)
+                    print(f"Game saved to {self.autosave.path}")
+                self.game_over = True
 
             else:
                 print("Invalid choice!")
 
+# Encapsulation: Converts a Game to and from a versioned binary snapshot (or JSON for debugging).
+# A snapshot only holds the current state, so loading costs the same however long the game ran.
+class GameSnapshot:
+    MAGIC = b"RPGS"
+    VERSION = 2
+    HEADERS = {
+        1: struct.Struct("<4sHI?I"),   # magic, version, floor, game over, turns
+        2: struct.Struct("<4sHI?IH"),  # ... plus floor size
+    }
+    HEADER = HEADERS[VERSION]
+    DEFAULT_FLOOR_SIZE = 3  # Version 1 saves predate configurable floor sizes
+    CHARACTER = struct.Struct("<BHi")  # class, level, health
+    WEAPON = struct.Struct("<ii")      # damage, durability
+    COUNT = struct.Struct("<H")
+    CLASSES = list(CharacterClass)
+
+    # --- binary form ---
+    @classmethod
+    def dumps(cls, game: Game) -> bytes:
+        parts = [cls.HEADER.pack(cls.MAGIC, cls.VERSION, game.current_floor, game.game_over, game.turns, game.floor_size)]
+        cls._write_character(parts, game.player)
+        parts.append(cls.COUNT.pack(len(game.enemies)))
+        for enemy in game.enemies:
+            cls._write_character(parts, enemy)
+        return b"".join(parts)
+
+    @classmethod
+    def loads(cls, data: bytes, rng=random, log=print) -> Game:
+        try:
+            return cls._loads(data, rng, log)
+        except (struct.error, IndexError) as e:
+            raise ValueError(f"Corrupt save file: {e}") from e
+
+    @classmethod
+    def _loads(cls, data: bytes, rng, log) -> Game:
+        magic, version = struct.unpack_from("<4sH", data, 0)
+        if magic != cls.MAGIC:
+            raise ValueError("Not an RPG save file")
+        if version not in cls.HEADERS:
+            raise ValueError(f"Unsupported save version {version}")
+        header = cls.HEADERS[version].unpack_from(data, 0)
+        floor, game_over, turns = header[2:5]
+        floor_size = header[5] if version >= 2 else cls.DEFAULT_FLOOR_SIZE
+        game = Game(rng=rng, log=log, floor_size=floor_size)
+        game.current_floor, game.game_over, game.turns = floor, game_over, turns
+        offset = cls.HEADERS[version].size
+        game.player, offset = cls._read_character(data, offset, game)
+        (count,), offset = cls.COUNT.unpack_from(data, offset), offset + cls.COUNT.size
+        for _ in range(count):
+            enemy, offset = cls._read_character(data, offset, game)
+            game.enemies.append(enemy)
+        return game
+
+    @classmethod
+    def _write_string(cls, parts, text: str):
+        encoded = text.encode("utf-8")
+        parts.append(cls.COUNT.pack(len(encoded)))
+        parts.append(encoded)
+
+    @classmethod
+    def _read_string(cls, data, offset):
+        (length,) = cls.COUNT.unpack_from(data, offset)
+        offset += cls.COUNT.size
+        return data[offset:offset + length].decode("utf-8"), offset + length
+
+    @classmethod
+    def _write_weapon(cls, parts, weapon: Weapon):
+        cls._write_string(parts, weapon.name)
+        parts.append(cls.WEAPON.pack(weapon.damage, weapon.durability))
+
+    @classmethod
+    def _read_weapon(cls, data, offset):
+        name, offset = cls._read_string(data, offset)
+        damage, durability = cls.WEAPON.unpack_from(data, offset)
+        return Weapon(name, damage, durability), offset + cls.WEAPON.size
+
+    @classmethod
+    def _write_character(cls, parts, character: Character):
+        parts.append(cls.CHARACTER.pack(cls.CLASSES.index(character.character_class), character.level, character.health))
+        cls._write_string(parts, character.name)
+        # The equipped weapon is stored first, followed by the inventory
+        weapons = ([character.weapon] if character.weapon else []) + character.inventory
+        parts.append(bytes([character.weapon is not None]))
+        parts.append(cls.COUNT.pack(len(weapons)))
+        for weapon in weapons:
+            cls._write_weapon(parts, weapon)
+
+    @classmethod
+    def _read_character(cls, data, offset, game: Game):
+        class_index, level, health = cls.CHARACTER.unpack_from(data, offset)
+        name, offset = cls._read_string(data, offset + cls.CHARACTER.size)
+        equipped = bool(data[offset])
+        (count,) = cls.COUNT.unpack_from(data, offset + 1)
+        offset += 1 + cls.COUNT.size
+        weapons = []
+        for _ in range(count):
+            weapon, offset = cls._read_weapon(data, offset)
+            weapons.append(weapon)
+        character = cls._restore(class_index, name, level, health, weapons, equipped, game)
+        return character, offset
+
+    @classmethod
+    def _restore(cls, class_index, name, level, health, weapons, equipped, game: Game) -> Character:
+        # Bypass __init__ so restoring doesn't re-run class setup (and its "equipped" messages)
+        char_class = cls.CLASSES[class_index]
+        character = CLASS_TYPES[char_class].__new__(CLASS_TYPES[char_class])
+        character.rng, character.log = game.rng, game.log
+        character.name, character.character_class = name, char_class
+        character.level, character.health = level, health
+        character.weapon = weapons.pop(0) if equipped else None
+        character.inventory = weapons
+        return character
+
+    # --- JSON debug form ---
+    @classmethod
+    def to_dict(cls, game: Game) -> dict:
+        def character(c: Character) -> dict:
+            return {
+                "name": c.name,
+                "class": c.character_class.name,
+                "level": c.level,
+                "health": c.health,
+                "weapon": weapon(c.weapon) if c.weapon else None,
+                "inventory": [weapon(w) for w in c.inventory],
+            }
+
+        def weapon(w: Weapon) -> dict:
+            return {"name": w.name, "damage": w.damage, "durability": w.durability}
+
+        return {
+            "version": cls.VERSION,
+            "floor": game.current_floor,
+            "game_over": game.game_over,
+            "turns": game.turns,
+            "floor_size": game.floor_size,
+            "player": character(game.player),
+            "enemies": [character(enemy) for enemy in game.enemies],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict, rng=random, log=print) -> Game:
+        try:
+            return cls._from_dict(data, rng, log)
+        except (KeyError, TypeError, IndexError, AttributeError) as e:
+            raise ValueError(f"Corrupt save file: {e!r}") from e
+
+    @classmethod
+    def _from_dict(cls, data: dict, rng, log) -> Game:
+        if not isinstance(data, dict):
+            raise ValueError("Not an RPG save file")
+        if data.get("version") not in cls.HEADERS:
+            raise ValueError(f"Unsupported save version {data.get('version')}")
+        game = Game(rng=rng, log=log, floor_size=data.get("floor_size", cls.DEFAULT_FLOOR_SIZE))
+        game.current_floor, game.game_over, game.turns = data["floor"], data["game_over"], data["turns"]
+
+        def character(c: dict) -> Character:
+            weapons = [Weapon(**w) for w in ([c["weapon"]] if c["weapon"] else []) + c["inventory"]]
+            class_index = cls.CLASSES.index(CharacterClass[c["class"]])
+            return cls._restore(class_index, c["name"], c["level"], c["health"], weapons, c["weapon"] is not None, game)
+
+        game.player = character(data["player"])
+        game.enemies = [character(enemy) for enemy in data["enemies"]]
+        return game
+
+    # --- files: .json paths use the debug form, anything else the binary form ---
+    @classmethod
+    def encode(cls, game: Game, path: str) -> bytes:
+        if path.endswith(".json"):
+            return json.dumps(cls.to_dict(game), indent=2).encode("utf-8")
+        return cls.dumps(game)
+
+    @classmethod
+    def save(cls, game: Game, path: str):
+        cls._write_atomic(path, cls.encode(game, path))
+
+    @classmethod
+    def load(cls, path: str, rng=random, log=print) -> Game:
+        with open(path, "rb") as file:
+            data = file.read()
+        if path.endswith(".json"):
+            return cls.from_dict(json.loads(data), rng, log)
+        return cls.loads(data, rng, log)
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes):
+        # Write to a temp file first so a crash mid-save never leaves a broken save behind
+        temp = f"{path}.tmp"
+        with open(temp, "wb") as file:
+            file.write(data)
+        os.replace(temp, path)
+
+# Encapsulation: Saves every N turns on a background thread so disk writes never stall the game loop
+class Autosaver:
+    def __init__(self, path: str, every: int = 10):
+        self.path = path
+        self.every = every
+        self._writer = ThreadPoolExecutor(max_workers=1)
+        self._pending = None
+
+    def tick(self, game: Game):
+        if self.every and game.turns % self.every == 0:
+            # Snapshot now (cheap, in memory); only the file write runs in the background.
+            # If the previous write is still running this one is skipped; the next tick catches up.
+            if self._pending is None or self._pending.done():
+                data = GameSnapshot.encode(game, self.path)
+                self._pending = self._writer.submit(GameSnapshot._write_atomic, self.path, data)
+
+    def save_now(self, game: Game):
+        self.wait()
+        GameSnapshot.save(game, self.path)
+
+    def wait(self):
+        if self._pending is not None:
+            self._pending.result()
+
+# Abstraction: Policies decide what a simulated player does each turn
+def attack_first_policy(game):
+    return "attack", 0
+
+def attack_random_policy(game):
+    return "attack", game.rng.randrange(len(game.enemies))
+
+def attack_weakest_policy(game):
+    healths = [enemy.health for enemy in game.enemies]
+    return "attack", healths.index(min(healths))
+
+def cautious_policy(game):
+    # Flee when badly hurt, otherwise finish off the weakest enemy
+    if game.player.health < 30:
+        return "flee", 0
+    return attack_weakest_policy(game)
+
+POLICIES = {
+    "first": attack_first_policy,
+    "random": attack_random_policy,
+    "weakest": attack_weakest_policy,
+    "cautious": cautious_policy,
+}
+
+@dataclass
+class RunResult:
+    character_class: CharacterClass
+    floors_reached: int
+    survived: bool
+    turns: int
+    damage_dealt: int
+    damage_taken: int
+
+# Encapsulation: Aggregated results for one class, mergeable across worker processes
+@dataclass
+class ClassReport:
+    runs: int = 0
+    survived: int = 0
+    floors: int = 0
+    turns: int = 0
+    damage_dealt: Counter = field(default_factory=Counter)  # per-run damage, bucketed by 10
+
+    def add(self, result: RunResult):
+        self.runs += 1
+        self.survived += result.survived
+        self.floors += result.floors_reached
+        self.turns += result.turns
+        self.damage_dealt[result.damage_dealt // 10 * 10] += 1
+
+    def merge(self, other: "ClassReport"):
+        self.runs += other.runs
+        self.survived += other.survived
+        self.floors += other.floors
+        self.turns += other.turns
+        self.damage_dealt.update(other.damage_dealt)
+
+    @classmethod
+    def from_arrays(cls, floors, survived, turns, damage_dealt) -> "ClassReport":
+        buckets, counts = np.unique(damage_dealt // 10 * 10, return_counts=True)
+        return cls(
+            runs=len(floors),
+            survived=int(survived.sum()),
+            floors=int(floors.sum()),
+            turns=int(turns.sum()),
+            damage_dealt=Counter({int(bucket): int(count) for bucket, count in zip(buckets, counts)}),
+        )
+
+    def damage_percentile(self, q: float) -> int:
+        target = q * self.runs
+        seen = 0
+        for bucket in sorted(self.damage_dealt):
+            seen += self.damage_dealt[bucket]
+            if seen >= target:
+                return bucket
+        return 0
+
+    def summary(self) -> str:
+        return (
+            f"win rate {self.survived / self.runs:6.1%} | "
+            f"avg floor {self.floors / self.runs:5.2f} | "
+            f"avg turns {self.turns / self.runs:6.1f} | "
+            f"damage p10/p50/p90 {self.damage_percentile(0.1)}/{self.damage_percentile(0.5)}/{self.damage_percentile(0.9)}"
+        )
+
+def simulate_run(char_class: CharacterClass, seed: int, policy=attack_weakest_policy,
+                 max_floors: int = 10, max_turns: int = 2000, floor_size: int = 3) -> RunResult:
+    """Play one game with no I/O; surviving until max_floors is cleared counts as a win."""
+    game = Game(rng=random.Random(seed), log=quiet, floor_size=floor_size)
+    game.create_player("Sim", char_class)
+    turns = dealt = taken = 0
+    while game.player.is_alive() and turns < max_turns:
+        if not game.enemies:
+            if game.current_floor >= max_floors:
+                break
+            game.next_floor()
+            continue
+        action, target = policy(game)
+        turn_dealt, turn_taken = game.take_turn(action, target)
+        dealt += turn_dealt
+        taken += turn_taken
+        turns += 1
+    return RunResult(char_class, game.current_floor, game.player.is_alive() and turns < max_turns,
+                     turns, dealt, taken)
+
+def _simulate_batch(char_class: CharacterClass, seeds: range, policy_name: str, max_floors: int,
+                    floor_size: int) -> ClassReport:
+    report = ClassReport()
+    policy = POLICIES[policy_name]
+    for seed in seeds:
+        report.add(simulate_run(char_class, seed, policy, max_floors, floor_size=floor_size))
+    return report
+
+def run_simulations(runs: int, policy_name: str = "weakest", max_floors: int = 10,
+                    seed: int = 0, workers: int = None, batch_size: int = 1000, floor_size: int = 3) -> dict:
+    """Simulate `runs` games per class across a process pool and return a ClassReport per class."""
+    reports = {char_class: ClassReport() for char_class in CharacterClass}
+    with ProcessPoolExecutor(workers) as pool:
+        futures = []
+        for offset, char_class in enumerate(CharacterClass):
+            # Every run gets its own seed, so results don't depend on how work is split
+            base = seed * 1_000_003 + offset * runs
+            for start in range(0, runs, batch_size):
+                seeds = range(base + start, base + min(start + batch_size, runs))
+                futures.append((char_class, pool.submit(_simulate_batch, char_class, seeds, policy_name,
+                                                                    max_floors, floor_size)))
+        for char_class, future in futures:
+            reports[char_class].merge(future.result())
+    return reports
+
+# Encapsulation: Thousands of games stored as arrays and advanced one turn at a time,
+# following exactly the same rules as Game.take_turn / simulate_run
+class BatchSimulator:
+    POLICIES = ("first", "random", "weakest")
+
+    def __init__(self, char_class: CharacterClass, runs: int, seed: int = 0, policy: str = "weakest",
+                 max_floors: int = 10, max_turns: int = 2000, floor_size: int = 3, scaling: ScalingTable = None):
+        if np is None:
+            raise RuntimeError("The batch simulator needs numpy (pip install numpy)")
+        if policy not in self.POLICIES:
+            raise ValueError(f"Batch simulator supports policies {self.POLICIES}")
+        self.char_class = char_class
+        self.runs = runs
+        self.rng = np.random.default_rng(seed)
+        self.policy = policy
+        self.max_floors = max_floors
+        self.max_turns = max_turns
+        self.floor_size = floor_size
+        self.health_bonus = np.array((scaling or ScalingTable()).health_bonuses(max_floors))
+        # Per-class stats read from the real classes so both engines share one source of truth
+        self.classes = list(CharacterClass)
+        sample = [CLASS_TYPES[c]("sample", c, log=quiet) for c in self.classes]
+        self.health = np.array([c.health for c in sample])
+        self.damage = np.array([c.weapon.damage for c in sample])
+        self.durability = np.array([c.weapon.durability for c in sample])
+        self.proc_chance = np.array([c.proc_chance for c in sample])
+        self.proc_low = np.array([c.proc_damage[0] for c in sample])
+        self.proc_high = np.array([c.proc_damage[1] for c in sample])
+
+    def _attack(self, cls, durability, mask):
+        """Damage from one attack per battle where mask is set; durability is updated in place."""
+        armed = mask & (durability > 0)
+        damage = self.damage[cls]
+        hits = self.rng.integers(damage // 2, damage + 1) * armed
+        durability -= armed
+        procs = mask & (self.rng.random(self.runs) < self.proc_chance[cls])
+        bonus = self.rng.integers(self.proc_low[cls], self.proc_high[cls] + 1) * procs
+        return hits + bonus
+
+    def _spawn(self, rows, floor):
+        cls = self.rng.integers(0, len(self.classes), size=(len(rows), self.floor_size))
+        self.enemy_class[rows] = cls
+        self.enemy_health[rows] = self.health[cls] + self.health_bonus[floor[rows, None]]
+        self.enemy_durability[rows] = self.durability[cls]
+        self.enemy_alive[rows] = True
+
+    def _targets(self):
+        if self.policy == "first":
+            return self.enemy_alive.argmax(axis=1)
+        if self.policy == "weakest":
+            return np.where(self.enemy_alive, self.enemy_health, np.iinfo(np.int64).max).argmin(axis=1)
+        # random: pick uniformly among the enemies still standing
+        rank = (self.rng.random(self.runs) * self.enemy_alive.sum(axis=1)).astype(int)
+        return (self.enemy_alive & (self.enemy_alive.cumsum(axis=1) == rank[:, None] + 1)).argmax(axis=1)
+
+    def run(self) -> ClassReport:
+        runs, rows = self.runs, np.arange(self.runs)
+        player = self.classes.index(self.char_class)
+        player_class = np.full(runs, player)
+        player_health = np.full(runs, self.health[player])
+        player_durability = np.full(runs, self.durability[player])
+        floor = np.ones(runs, dtype=np.int64)
+        turns = np.zeros(runs, dtype=np.int64)
+        dealt = np.zeros(runs, dtype=np.int64)
+        won = np.zeros(runs, dtype=bool)
+        active = np.ones(runs, dtype=bool)
+
+        shape = (runs, self.floor_size)
+        self.enemy_class = np.zeros(shape, dtype=np.int64)
+        self.enemy_health = np.zeros(shape, dtype=np.int64)
+        self.enemy_durability = np.zeros(shape, dtype=np.int64)
+        self.enemy_alive = np.zeros(shape, dtype=bool)
+        self._spawn(rows, floor)
+
+        while active.any():
+            # Floors with no enemies left: finish the run or move down a floor
+            cleared = active & ~self.enemy_alive.any(axis=1)
+            finished = cleared & (floor >= self.max_floors)
+            won |= finished
+            active &= ~finished
+            advance = cleared & ~finished
+            if advance.any():
+                floor += advance
+                player_health += 20 * advance
+                self._spawn(rows[advance], floor)
+
+            # The player hits the chosen enemy
+            target = self._targets()
+            damage = self._attack(player_class, player_durability, active)
+            dealt += damage
+            self.enemy_health[rows, target] -= damage
+            self.enemy_alive[rows, target] &= self.enemy_health[rows, target] > 0
+
+            # Surviving enemies strike back in order until the player falls
+            for slot in range(self.floor_size):
+                attacking = active & self.enemy_alive[:, slot] & (player_health > 0)
+                durability = self.enemy_durability[:, slot]
+                player_health -= self._attack(self.enemy_class[:, slot], durability, attacking)
+                self.enemy_durability[:, slot] = durability
+
+            turns += active
+            active &= (player_health > 0) & (turns < self.max_turns)
+
+        return ClassReport.from_arrays(floor, won, turns, dealt)
+
+def compare_engines(char_class: CharacterClass, runs: int, policy: str = "weakest",
+                    max_floors: int = 10, seed: int = 0, floor_size: int = 3) -> dict:
+    """Run both engines and return, per metric, (object value, batch value, z-score of the gap)."""
+    results = [simulate_run(char_class, seed * 1_000_003 + i, POLICIES[policy], max_floors, floor_size=floor_size)
+               for i in range(runs)]
+    object_stats = {
+        "win rate": np.array([r.survived for r in results], dtype=float),
+        "floors": np.array([r.floors_reached for r in results], dtype=float),
+        "turns": np.array([r.turns for r in results], dtype=float),
+        "damage": np.array([r.damage_dealt for r in results], dtype=float),
+    }
+    simulator = BatchSimulator(char_class, runs, seed, policy, max_floors, floor_size=floor_size)
+    report = simulator.run()
+    batch_means = {
+        "win rate": report.survived / runs,
+        "floors": report.floors / runs,
+        "turns": report.turns / runs,
+        "damage": sum(bucket * count for bucket, count in report.damage_dealt.items()) / runs,
+    }
+    comparison = {}
+    for metric, values in object_stats.items():
+        mean = values.mean()
+        if metric == "damage":
+            mean = (values // 10 * 10).mean()  # Compare on the same 10-point buckets the report keeps
+            values = values // 10 * 10
+        error = np.sqrt(2 * values.var() / runs) or 1e-12
+        comparison[metric] = (mean, batch_means[metric], (batch_means[metric] - mean) / error)
+    return comparison
+
+def main():
+    parser = argparse.ArgumentParser(description="Python RPG")
+    subparsers = parser.add_subparsers(dest="command")
+    simulate = subparsers.add_parser("simulate", help="Run headless battles to compare class balance")
+    simulate.add_argument("--runs", type=int, default=10_000, help="Games per class")
+    simulate.add_argument("--policy", choices=POLICIES, default="weakest")
+    simulate.add_argument("--floors", type=int, default=5, help="Floors to clear for a win")
+    simulate.add_argument("--seed", type=int, default=0)
+    simulate.add_argument("--workers", type=int, default=None)
+    simulate.add_argument("--engine", choices=["object", "batch"], default="object",
+                          help="object: real Character classes in a process pool; batch: NumPy arrays")
+    simulate.add_argument("--compare", action="store_true",
+                          help="Check the batch engine against the object engine statistically")
+    inspect = subparsers.add_parser("inspect", help="Print a save file in its JSON debug form")
+    inspect.add_argument("path")
+    inspect.add_argument("--convert", metavar="OUT", help="Write the save to OUT (.json for debug form, else binary)")
+    parser.add_argument("--save", default="savegame.rpg", help="Save file (.json for the debug form)")
+    parser.add_argument("--autosave", type=int, default=10, help="Autosave every N turns (0 disables)")
+    parser.add_argument("--enemies", type=int, default=3, help="Enemies per floor")
+    args = parser.parse_args()
+
+    if args.command == "simulate" and args.compare:
+        for char_class in CharacterClass:
+            comparison = compare_engines(char_class, args.runs, args.policy, args.floors, args.seed, args.enemies)
+            for metric, (object_value, batch_value, z) in comparison.items():
+                flag = "ok" if abs(z) < 4 else "MISMATCH"
+                print(f"{char_class.name:<8} {metric:<9} object {object_value:8.3f} batch {batch_value:8.3f} z {z:+5.2f} {flag}")
+    elif args.command == "simulate":
+        if args.engine == "batch":
+            reports = {
+                char_class: BatchSimulator(char_class, args.runs, args.seed + offset, args.policy, args.floors,
+                                           floor_size=args.enemies).run()
+                for offset, char_class in enumerate(CharacterClass)
+            }
+        else:
+            reports = run_simulations(args.runs, args.policy, args.floors, args.seed, args.workers,
+                                      floor_size=args.enemies)
+        for char_class, report in reports.items():
+            print(f"{char_class.name:<8} {report.summary()}")
+    elif args.command == "inspect":
+        try:
+            game = GameSnapshot.load(args.path, log=quiet)
+        except (OSError, ValueError, struct.error) as e:
+            parser.error(f"cannot read {args.path}: {e}")
+        if args.convert:
+            GameSnapshot.save(game, args.convert)
+        else:
+            print(json.dumps(GameSnapshot.to_dict(game), indent=2))
+    else:
+        game = None
+        if os.path.exists(args.save) and input(f"Load saved game from {args.save}? (y/n): ").lower() == "y":
+            try:
+                game = GameSnapshot.load(args.save)
+            except (OSError, ValueError, struct.error) as e:
+                print(f"Could not load {args.save} ({e}). Starting a new game instead.")
+        if game is None:
+            game = Game(floor_size=args.enemies)
+        game.autosave = Autosaver(args.save, args.autosave)
+        try:
+            if game.player:
+                game._game_loop()
+            else:
+                game.start_game()
+        except (KeyboardInterrupt, EOFError):
+            if game.player is None:
+                # Interrupted before a character existed: nothing worth saving
+                print("\nGoodbye!")
+                return
+            game.autosave.save_now(game)
+            print(f"\nGame saved to {args.save}")
+            return
+        game.autosave.wait()
+        # A finished run has nothing left to resume
+        if not game.player.is_alive() and os.path.exists(args.save):
+            os.remove(args.save)
+
 if __name__ == "__main__":
-    game = Game()
-    game.start_game()
+    main()
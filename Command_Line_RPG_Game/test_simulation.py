@@ -0,0 +1,19 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+spec = importlib.util.spec_from_file_location("rpg_main", Path(__file__).parent / "main.py")
+rpg = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(rpg)
+
+RUNS = 300
+
+
+@pytest.mark.parametrize("char_class", list(rpg.CharacterClass), ids=lambda c: c.name)
+@pytest.mark.parametrize("policy", rpg.BatchSimulator.POLICIES)
+@pytest.mark.parametrize("max_floors, floor_size", [(3, 3), (3, 1), (1, 1)], ids=["crowded", "duels", "one-duel"])
+def test_batch_engine_matches_object_engine(char_class, policy, max_floors, floor_size):
+    comparison = rpg.compare_engines(char_class, RUNS, policy, max_floors, seed=7, floor_size=floor_size)
+    for metric, (object_mean, batch_mean, z) in comparison.items():
+        assert abs(z) < 4, f"{metric}: object {object_mean:.3f} vs batch {batch_mean:.3f} (z={z:.2f})"
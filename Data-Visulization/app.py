@@ -1,48 +1,242 @@
+import os
+import sqlite3
 import streamlit as st
 import pandas as pd
-# import numpy as np
+import numpy as np
 import plotly.express as px
+import plotly.graph_objects as go
 from abc import ABC, abstractmethod
 
+# Figures are rebuilt only when the data version or the chosen options change
+@st.cache_resource(max_entries=32, show_spinner="Rendering chart...")
+def _cached_figure(key, _visualizer: "DataVisualizer", _data: pd.DataFrame, options: tuple) -> go.Figure:
+    return _visualizer.build_figure(_data, **dict(options))
+
 # Abstract Base Class (Abstraction)
 class DataVisualizer(ABC):
+    uses_summary = True  # Gets the per-Category summary; False means raw rows plus chosen columns
+    WEBGL_THRESHOLD = 1_000  # Above this many points, draw with WebGL instead of SVG
+
     @abstractmethod
-    def visualize(self, data):
+    def build_figure(self, data, **options) -> go.Figure:
         pass
 
+    def visualize(self, data, version=None, **options):
+        options = tuple(sorted(options.items()))
+        if version is None:
+            fig = self.build_figure(data, **dict(options))
+        else:
+            fig = _cached_figure((version, type(self).__name__, options), self, data, options)
+        st.plotly_chart(fig)
+
+    @staticmethod
+    def top_n(data, n: int):
+        # Keeps the n largest categories and folds the rest into a single "Other" row
+        if len(data) <= n:
+            return data
+        data = data.sort_values('Value', ascending=False)
+        other = pd.DataFrame({'Category': ['Other'], 'Value': [data['Value'].iloc[n:].sum()]})
+        return pd.concat([data.head(n)[['Category', 'Value']], other], ignore_index=True)
+
 # Concrete Classes (Inheritance)
 class BarChartVisualizer(DataVisualizer):
-    def visualize(self, data):
-        fig = px.bar(data, x='Category', y='Value', title='Bar Chart Visualization')
-        st.plotly_chart(fig)
+    MAX_BARS = 50
+
+    def build_figure(self, data, **options):
+        data = self.top_n(data, self.MAX_BARS)
+        return px.bar(data, x='Category', y='Value', title='Bar Chart Visualization')
 
 class PieChartVisualizer(DataVisualizer):
-    def visualize(self, data):
-        fig = px.pie(data, values='Value', names='Category', title='Pie Chart Visualization')
-        st.plotly_chart(fig)
+    MAX_SLICES = 8
+
+    def build_figure(self, data, **options):
+        data = self.top_n(data, self.MAX_SLICES)
+        return px.pie(data, values='Value', names='Category', title='Pie Chart Visualization')
+
+class ScatterPlotVisualizer(DataVisualizer):
+    uses_summary = False
+    MAX_POINTS = 200_000  # Larger datasets are drawn from a fixed random sample
+
+    def build_figure(self, data, x=None, y=None):
+        title = f'{y} vs {x}'
+        if len(data) > self.MAX_POINTS:
+            title += f' (sample of {self.MAX_POINTS:,} from {len(data):,} points)'
+            data = data.sample(self.MAX_POINTS, random_state=0)
+        trace = go.Scattergl if len(data) > self.WEBGL_THRESHOLD else go.Scatter
+        fig = go.Figure(trace(x=data[x].to_numpy(), y=data[y].to_numpy(), mode='markers',
+                              marker={'size': 3, 'opacity': 0.5}))
+        return fig.update_layout(title=title, xaxis_title=x, yaxis_title=y)
+
+class LineChartVisualizer(DataVisualizer):
+    uses_summary = False
+    MAX_BINS = 2_000  # Above this many points, draw per-bin mean with a min/max band
+
+    def build_figure(self, data, x=None, y=None):
+        data = data[[x, y]].dropna().sort_values(x)
+        xs, ys = data[x].to_numpy(dtype=float), data[y].to_numpy(dtype=float)
+        fig = go.Figure()
+        if len(xs) <= self.MAX_BINS:
+            trace = go.Scattergl if len(xs) > self.WEBGL_THRESHOLD else go.Scatter
+            fig.add_trace(trace(x=xs, y=ys, mode='lines', name=y))
+            return fig.update_layout(title=f'{y} by {x}', xaxis_title=x, yaxis_title=y)
+
+        # Bin x into equal-width buckets; min/max keep spikes visible that a plain mean would hide
+        width = (xs[-1] - xs[0]) / self.MAX_BINS or 1.0
+        bins = np.minimum(((xs - xs[0]) / width).astype(int), self.MAX_BINS - 1)
+        grouped = pd.DataFrame({'bin': bins, 'x': xs, 'y': ys}).groupby('bin').agg(
+            x=('x', 'mean'), mean=('y', 'mean'), low=('y', 'min'), high=('y', 'max'))
+        fig.add_trace(go.Scattergl(x=grouped['x'], y=grouped['high'], mode='lines', line={'width': 0},
+                                   showlegend=False, hoverinfo='skip'))
+        fig.add_trace(go.Scattergl(x=grouped['x'], y=grouped['low'], mode='lines', line={'width': 0},
+                                   fill='tonexty', name='min / max'))
+        fig.add_trace(go.Scattergl(x=grouped['x'], y=grouped['mean'], mode='lines', name=f'mean {y}'))
+        return fig.update_layout(title=f'{y} by {x} ({len(xs):,} points in {len(grouped):,} bins)',
+                                 xaxis_title=x, yaxis_title=y)
+
+class HeatmapVisualizer(DataVisualizer):
+    uses_summary = False
+    BINS = 200
+
+    def build_figure(self, data, x=None, y=None):
+        data = data[[x, y]].dropna()
+        # Counted on the server: the browser gets a BINS x BINS grid, however many rows there are
+        counts, x_edges, y_edges = np.histogram2d(data[x], data[y], bins=self.BINS)
+        fig = go.Figure(go.Heatmap(
+            z=counts.T, x=(x_edges[:-1] + x_edges[1:]) / 2, y=(y_edges[:-1] + y_edges[1:]) / 2,
+            colorscale='Viridis', colorbar={'title': 'rows'}))
+        return fig.update_layout(title=f'Density of {y} vs {x} ({len(data):,} rows)', xaxis_title=x, yaxis_title=y)
+
+# Abstract Base Class (Abstraction): where the dashboard's rows come from
+class DataSource(ABC):
+    @abstractmethod
+    def load(self) -> pd.DataFrame:
+        pass
+
+    @abstractmethod
+    def version(self):
+        """Changes whenever the underlying data changes, so cached copies are rebuilt."""
+
+    def cache_key(self):
+        return (type(self).__name__, self.version())
+
+    def frame(self) -> pd.DataFrame:
+        # The shared cached copy, so summary, preview and raw-row charts parse the data once per version
+        return _cached(self.cache_key(), 'load', self)
+
+    def summary(self) -> pd.DataFrame:
+        # Pre-aggregated by Category, so the charts only ever see one row per category
+        data = self.frame()
+        summary = data.groupby('Category', observed=True)['Value'].agg(Value='sum', Count='count').reset_index()
+        return summary.sort_values('Value', ascending=False, ignore_index=True)
+
+    def preview(self, rows: int) -> pd.DataFrame:
+        return self.frame().head(rows)
+
+    @staticmethod
+    def from_path(path: str, table: str = 'data') -> "DataSource":
+        if not path:
+            return SampleDataSource()
+        if path.endswith(('.db', '.sqlite', '.sqlite3')):
+            return SQLiteDataSource(path, table)
+        return FileDataSource(path)
+
+# Concrete Classes (Inheritance)
+class SampleDataSource(DataSource):
+    def load(self):
+        return pd.DataFrame({
+            'Category': ['A', 'B', 'C', 'D'],
+            'Value': [10, 20, 30, 40]
+        })
+
+    def version(self):
+        return 0
+
+class FileDataSource(DataSource):
+    def __init__(self, path: str):
+        self.path = path
+
+    def version(self):
+        stat = os.stat(self.path)
+        return (self.path, stat.st_mtime_ns, stat.st_size)
+
+    def load(self):
+        if self.path.endswith(('.parquet', '.pq')):
+            data = pd.read_parquet(self.path)
+        else:
+            data = pd.read_csv(self.path, engine='pyarrow')
+        # Categorical storage keeps millions of repeated labels small and speeds up grouping
+        data['Category'] = data['Category'].astype('category')
+        return data
+
+class SQLiteDataSource(DataSource):
+    def __init__(self, path: str, table: str):
+        self.path = path
+        self.table = '"' + table.replace('"', '""') + '"'
+
+    def version(self):
+        # Writes in WAL mode land in the -wal file before the main database
+        stamps = [os.stat(self.path).st_mtime_ns]
+        if os.path.exists(self.path + '-wal'):
+            stamps.append(os.stat(self.path + '-wal').st_mtime_ns)
+        return (self.path, self.table, *stamps)
+
+    def _query(self, sql: str) -> pd.DataFrame:
+        with sqlite3.connect(f"file:{self.path}?mode=ro", uri=True) as connection:
+            return pd.read_sql_query(sql, connection)
+
+    def load(self):
+        data = self._query(f"SELECT * FROM {self.table}")
+        data['Category'] = data['Category'].astype('category')
+        return data
+
+    def summary(self):
+        # Let SQLite aggregate so the full table never has to be loaded for the charts
+        return self._query(
+            f"SELECT Category, SUM(Value) AS Value, COUNT(Value) AS Count FROM {self.table} "
+            "GROUP BY Category ORDER BY Value DESC"
+        )
+
+    def preview(self, rows: int):
+        return self._query(f"SELECT * FROM {self.table} LIMIT {int(rows)}")
+
+# Shared across every session and rerun; the source's version is part of the key, so a changed file is reloaded
+@st.cache_resource(max_entries=16, show_spinner="Loading data...")
+def _cached(key, method: str, _source: DataSource, *args) -> pd.DataFrame:
+    return getattr(_source, method)(*args)
 
 # Encapsulation Example
 class DataManager:
-    def __init__(self):
+    PREVIEW_ROWS = 1000
+
+    def __init__(self, source: DataSource = None):
+        self._source = source or SampleDataSource()  # Private attribute
         self._data = None  # Private attribute
     
     def load_data(self):
-        # Sample data
-        self._data = pd.DataFrame({
-            'Category': ['A', 'B', 'C', 'D'],
-            'Value': [10, 20, 30, 40]
-        })
+        self._data = self._source.frame()
     
     def get_data(self):
         return self._data
 
+    def get_summary(self):
+        return _cached(self._source.cache_key(), 'summary', self._source)
+
+    def get_version(self):
+        return self._source.cache_key()
+
+    def get_preview(self):
+        return _cached(self._source.cache_key(), 'preview', self._source, self.PREVIEW_ROWS)
+
 # Polymorphism Example
 class Dashboard:
     def __init__(self):
-        self.data_manager = DataManager()
+        self.data_manager = None
         self.visualizers = {
             'Bar Chart': BarChartVisualizer(),
-            'Pie Chart': PieChartVisualizer()
+            'Pie Chart': PieChartVisualizer(),
+            'Scatter Plot': ScatterPlotVisualizer(),
+            'Line Chart': LineChartVisualizer(),
+            'Heatmap': HeatmapVisualizer()
         }
     
     def run(self):
@@ -54,28 +248,57 @@ class Dashboard:
             "Select Chart Type",
             list(self.visualizers.keys())
         )
+        path = st.sidebar.text_input(
+            "Data file (CSV, Parquet or SQLite)",
+            os.getenv("DASHBOARD_DATA", ""),
+            help="Needs 'Category' and 'Value' columns. Leave empty for sample data."
+        )
+        table = 'data'
+        if path.endswith(('.db', '.sqlite', '.sqlite3')):
+            table = st.sidebar.text_input("SQLite table", "data")
         
-        # Load data
-        self.data_manager.load_data()
-        data = self.data_manager.get_data()
+        # Load data (cached: only the first run after a file changes does any work)
+        self.data_manager = DataManager(DataSource.from_path(path, table))
+        try:
+            summary = self.data_manager.get_summary()
+            preview = self.data_manager.get_preview()
+        except (OSError, KeyError, ValueError, sqlite3.Error) as e:
+            st.error(f"Could not load {path}: {e}")
+            return
+        rows = int(summary['Count'].sum())
         
         # Display data
         st.subheader("Data Preview")
-        st.dataframe(data)
+        if rows > len(preview):
+            st.caption(f"Showing the first {len(preview):,} of {rows:,} rows")
+        st.dataframe(preview)
         
         # Visualize data based on user selection
         st.subheader("Data Visualization")
-        self.visualizers[chart_type].visualize(data)
+        visualizer = self.visualizers[chart_type]
+        version = self.data_manager.get_version()
+        if visualizer.uses_summary:
+            visualizer.visualize(summary, version)
+        else:
+            self.data_manager.load_data()
+            data = self.data_manager.get_data()
+            numeric = list(data.select_dtypes('number').columns)
+            if len(numeric) < 2:
+                st.info(f"{chart_type} needs at least two numeric columns.")
+            else:
+                x = st.sidebar.selectbox("X axis", numeric, index=0)
+                y = st.sidebar.selectbox("Y axis", numeric, index=1)
+                visualizer.visualize(data, version, x=x, y=y)
         
         # Additional interactive features
         st.subheader("Data Analysis")
         col1, col2 = st.columns(2)
         
         with col1:
-            st.metric("Total Value", data['Value'].sum())
+            st.metric("Total Value", summary['Value'].sum())
         
         with col2:
-            st.metric("Average Value", data['Value'].mean())
+            st.metric("Average Value", summary['Value'].sum() / rows if rows else 0)
 
 # Main function
 def main():
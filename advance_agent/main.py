@@ -1,51 +1,160 @@
+import asyncio
+import html
+import json
+import logging
 import os
+import re
+import sqlite3
+import threading
+import time
 import requests
-from typing import Optional, Dict
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Callable, Optional, Dict
 from dotenv import load_dotenv
-from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel
+from agents import Agent, Runner
 from agents.tool import function_tool
 import chainlit as cl
+from chainlit.server import app as server
+from fastapi.responses import PlainTextResponse
+from openai.types.responses import ResponseTextDeltaEvent
+from agent_common.replies import IntentClassifier, ResponseCache
+from agent_common.model_provider import ModelProvider
 
 load_dotenv()
 
-# 🎯 OOP Class for API Setup (Encapsulation)
+logger = logging.getLogger(__name__)
 
+# Most agent runs one worker process may stream at the same time
+MAX_CONCURRENT_RUNS = int(os.getenv("MAX_CONCURRENT_RUNS", "32"))
+# Rough token budget for the history sent with each message
+HISTORY_TOKEN_BUDGET = int(os.getenv("HISTORY_TOKEN_BUDGET", "3000"))
+# Optional SQLite file so sessions resume where they left off
+HISTORY_DB = os.getenv("HISTORY_DB")
+# Answer plain greetings/goodbyes locally instead of calling the model
+LOCAL_INTENTS = os.getenv("AGENT_LOCAL_INTENTS", "1") == "1"
 
-class GeminiProvider:
-    def __init__(self):
-        self.api_key = os.getenv("GEMINI_API_KEY")
-        self.base_url = "https://generativelanguage.googleapis.com/v1beta/openai"
+# 🎯 Shared provider (Encapsulation): one pooled client per process, endpoint set by
+# GEMINI_BASE_URL / GEMINI_MODEL, and timing for every model call
+provider_instance = ModelProvider.shared()  # 🧱 Object
+model = provider_instance.get_model()
 
-    def get_provider(self):
-        return AsyncOpenAI(
-            api_key=self.api_key,
-            base_url=self.base_url
-        )
 
-# Instantiate GeminiProvider and create model
-provider_instance = GeminiProvider()  # 🧱 Object
-provider = provider_instance.get_provider()
-model = OpenAIChatCompletionsModel(model="gemini-2.0-flash", openai_client=provider)
+@server.get("/metrics")
+async def metrics():
+    return PlainTextResponse(provider_instance.metrics.to_prometheus())
+
+
+# Chainlit registers a catch-all route for its UI first, so move /metrics ahead of it
+server.router.routes.insert(0, server.router.routes.pop())
+
+
+
+# 🎯 Encapsulation: One pooled HTTP session with timeouts and a TTL cache.
+# Fresh entries are served directly; stale ones are served while a background refresh runs.
+
+
+class CachedPageFetcher:
+    def __init__(self, ttl: float = 600, stale_ttl: float = 86400, timeout=(3.05, 10)):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.timeout = timeout
+        self.session = requests.Session()
+        retries = Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+        self.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retries))
+        self._cache = {}  # url -> (fetched_at, extracted text)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=2)
+
+    def get(self, url: str, extract: Callable[[str], str]) -> str:
+        entry = self._cache.get(url)
+        if entry:
+            age = time.monotonic() - entry[0]
+            if age < self.ttl:
+                return entry[1]
+            if age < self.stale_ttl:
+                self._refresh_in_background(url, extract)
+                return entry[1]
+        return self._fetch(url, extract)
 
+    def _fetch(self, url: str, extract: Callable[[str], str]) -> str:
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        text = extract(response.text)  # Only the compact summary is cached, never the raw page
+        self._cache[url] = (time.monotonic(), text)
+        return text
 
+    def _refresh_in_background(self, url: str, extract: Callable[[str], str]):
+        with self._lock:
+            if url in self._refreshing:
+                return
+            self._refreshing.add(url)
+
+        def refresh():
+            try:
+                self._fetch(url, extract)
+            except requests.RequestException:
+                pass  # Keep serving the stale copy; the next call tries again
+            finally:
+                with self._lock:
+                    self._refreshing.discard(url)
+
+        self._refresher.submit(refresh)
+
+
+# (Abstraction + Static): Reduces a YouTube channel page to the few facts the agent needs
+
+
+class YouTubeChannelSummary:
+    META = re.compile(r'<meta (?:property|name)="(og:title|og:description|og:url)" content="([^"]*)"')
+    SUBSCRIBERS = re.compile(r'"subscriberCountText":\{.*?"simpleText":"([^"]+)"')
+    VIDEO_TITLES = re.compile(r'"videoRenderer":\{"videoId":"[^"]+".*?"title":\{"runs":\[\{"text":"((?:[^"\\]|\\.)*)"')
+    MAX_VIDEOS = 10
+
+    @classmethod
+    def extract(cls, page: str) -> str:
+        meta = {key: html.unescape(value) for key, value in cls.META.findall(page)}
+        subscribers = cls.SUBSCRIBERS.search(page)
+        videos = []
+        for title in cls.VIDEO_TITLES.findall(page):
+            title = json.loads(f'"{title}"')
+            if title not in videos:
+                videos.append(title)
+            if len(videos) == cls.MAX_VIDEOS:
+                break
+        summary = {
+            "channel": meta.get("og:title"),
+            "url": meta.get("og:url"),
+            "description": meta.get("og:description"),
+            "subscribers": subscribers.group(1) if subscribers else None,
+            "recent_videos": videos,
+        }
+        return json.dumps({key: value for key, value in summary.items() if value})
 
-# (Abstraction + Static)
 
 class SubhanDataFetcher:
+    CHANNEL_URL = "https://www.youtube.com/@subhankaladi"
+    fetcher = CachedPageFetcher()
+
     @staticmethod
     @function_tool("get_subhan_data")
-    def get_subhan_data() -> str:
+    async def get_subhan_data() -> str:
         try:
-            response = requests.get("https://www.youtube.com/@subhankaladi")
-            if response.status_code == 200:
-                return  response.text
-            else :
-                return f"Error: {response.status_code}"
-            
+            # Cache hits return immediately; a real fetch runs off the event loop
+            return await asyncio.to_thread(
+                SubhanDataFetcher.fetcher.get, SubhanDataFetcher.CHANNEL_URL, YouTubeChannelSummary.extract
+            )
+        except requests.HTTPError as e:
+            return f"Error: {e.response.status_code}"
         except Exception as e:
             return f"Error: {str(e)}"
-        
+
 class SubhanAgentFactory:
+    GREETING = "Salam from Subhan Kaladi"
+    GOODBYE = "Allah Hafiz from Subhan Kaladi"
+
     @staticmethod
     def create_agent():
         return Agent(
@@ -69,6 +178,179 @@ class SubhanAgentFactory:
 agent = SubhanAgentFactory.create_agent()
 
 
+# 🎯 Encapsulation: Streams agent replies token by token, capped per process
+class StreamingAgentRunner:
+    def __init__(self, agent: Agent, max_concurrent: int):
+        self.agent = agent
+        self._slots = asyncio.Semaphore(max_concurrent)
+
+    async def stream(self, history: list, message: cl.Message) -> Optional[str]:
+        """Streams the reply into `message`; returns the final output, or None if the run produced none.
+
+        Raises CancelledError (after stopping the agent run) if the calling task is cancelled.
+        """
+        async with self._slots:
+            result = Runner.run_streamed(self.agent, input=history)
+            deltas = asyncio.Queue()
+
+            # The SDK (<=0.0.12) has no cancel(); cancelling the task that is waiting inside
+            # stream_events() makes it stop the run itself. This pump only ever waits there.
+            async def pump():
+                try:
+                    async for event in result.stream_events():
+                        if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+                            deltas.put_nowait(event.data.delta)
+                finally:
+                    deltas.put_nowait(None)
+
+            pump_task = asyncio.create_task(pump())
+            try:
+                while (delta := await deltas.get()) is not None:
+                    await message.stream_token(delta)
+                await pump_task  # Re-raises errors from the run
+            finally:
+                if not pump_task.done():
+                    pump_task.cancel()
+                    await asyncio.wait([pump_task])
+            return result.final_output
+
+
+agent_runner = StreamingAgentRunner(agent, MAX_CONCURRENT_RUNS)
+
+
+# Channel data changes, so cached answers expire along with the fetched page
+response_cache = ResponseCache(agent.instructions, ttl=600, path=os.getenv("RESPONSE_CACHE_DB"))
+intents = IntentClassifier(
+    {"greeting": SubhanAgentFactory.GREETING, "goodbye": SubhanAgentFactory.GOODBYE}
+) if LOCAL_INTENTS else None
+reply_stats = {"requests": 0, "model_calls": 0}
+
+
+def cache_stats() -> dict:
+    requests_seen, model_calls = reply_stats["requests"], reply_stats["model_calls"]
+    return {
+        "requests": requests_seen,
+        "intent_hits": intents.hits if intents else 0,
+        "cache_hits": response_cache.hits,
+        "model_calls": model_calls,
+        "hit_rate": (requests_seen - model_calls) / requests_seen if requests_seen else 0.0,
+    }
+
+
+# 🎯 Encapsulation: Saves each session's summary and recent turns (never the full transcript)
+class HistoryStore:
+    def __init__(self, path: str):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions (id TEXT PRIMARY KEY, summary TEXT, messages TEXT, updated_at REAL)"
+        )
+
+    def load(self, session_id: str):
+        row = self.conn.execute("SELECT summary, messages FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        if row is None:
+            return "", []
+        return row[0], json.loads(row[1])
+
+    def save(self, session_id: str, summary: str, messages: list):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?)",
+                (session_id, summary, json.dumps(messages), time.time()),
+            )
+
+
+# (Abstraction): Folds older turns into the running summary with a small model call
+
+
+class HistorySummarizer:
+    def __init__(self, model):
+        self.agent = Agent(
+            name="History Summarizer",
+            instructions=(
+                "Summarise the conversation for another assistant who will continue it. "
+                "Merge the previous summary with the new turns. Keep names, facts and open questions; "
+                "drop greetings and small talk. Use at most 150 words."
+            ),
+            model=model,
+        )
+
+    async def summarize(self, summary: str, messages: list) -> str:
+        transcript = "\n".join(f"{message['role']}: {message['content']}" for message in messages)
+        result = await Runner.run(self.agent, f"Previous summary:\n{summary or '(none)'}\n\nNew turns:\n{transcript}")
+        return result.final_output
+
+
+# 🎯 Encapsulation: Recent turns are kept word for word, older ones only as a summary,
+# so what is sent to the model stays within a token budget however long the chat runs.
+# Summarising is best effort; a hard cap of twice the budget holds even if it keeps failing.
+
+
+class ConversationHistory:
+    def __init__(self, session_id: str, store: Optional[HistoryStore] = None,
+                 token_budget: int = 3000, keep_recent: int = 6):
+        self.session_id = session_id
+        self.store = store
+        self.token_budget = token_budget
+        self.keep_recent = keep_recent
+        self.summary, self.messages = store.load(session_id) if store else ("", [])
+        self._compaction = None  # Background summarisation task, at most one per session
+        self._enforce_cap()
+
+    @staticmethod
+    def count_tokens(text: str) -> int:
+        return len(text) // 4 + 1  # About four characters per token is close enough for budgeting
+
+    def tokens(self) -> int:
+        return self.count_tokens(self.summary) + sum(self.count_tokens(m["content"]) for m in self.messages)
+
+    def append(self, role: str, content: str):
+        self.messages.append({"role": role, "content": content[:self.token_budget * 4]})
+        self._enforce_cap()
+
+    def _enforce_cap(self):
+        # Drop the oldest turns outright once twice the budget is reached, summarised or not
+        self.summary = self.summary[:self.token_budget * 2]
+        while len(self.messages) > 1 and self.tokens() > 2 * self.token_budget:
+            self.messages.pop(0)
+
+    def as_input(self) -> list:
+        items = []
+        if self.summary:
+            items.append({"role": "system", "content": f"Summary of the earlier conversation: {self.summary}"})
+        return items + list(self.messages)
+
+    def schedule_compaction(self, summarizer: HistorySummarizer):
+        """Summarises in a task of its own, so cancelling the message handler doesn't cancel it."""
+        if self.tokens() <= self.token_budget or len(self.messages) <= self.keep_recent:
+            return
+        if self._compaction is None or self._compaction.done():
+            self._compaction = asyncio.create_task(self._compact(summarizer))
+
+    async def _compact(self, summarizer: HistorySummarizer):
+        older = self.messages[:-self.keep_recent]
+        try:
+            summary = await summarizer.summarize(self.summary, older)
+        except Exception:
+            logger.warning("Summarising history for %s failed; relying on the hard cap", self.session_id, exc_info=True)
+            return
+        if not summary:
+            return
+        # Turns may have been appended (or capped away) meanwhile, so drop exactly the ones summarised
+        summarised = {id(message) for message in older}
+        self.messages = [message for message in self.messages if id(message) not in summarised]
+        self.summary = summary
+        self._enforce_cap()
+        self.save()
+
+    def save(self):
+        if self.store:
+            self.store.save(self.session_id, self.summary, self.messages)
+
+
+history_store = HistoryStore(HISTORY_DB) if HISTORY_DB else None
+summarizer = HistorySummarizer(model)
+
+
 @cl.oauth_callback
 def oauth_callback(
     provider_id: str,
@@ -82,7 +364,9 @@ def oauth_callback(
 
 @cl.on_chat_start
 async def handle_chat_start():
-    cl.user_session.set("history", [])
+    user = cl.user_session.get("user")
+    session_id = user.identifier if user else cl.user_session.get("id")
+    cl.user_session.set("history", ConversationHistory(session_id, history_store, HISTORY_TOKEN_BUDGET))
     await cl.Message(
         content="Hello! How can I help you today?"
     ).send()
@@ -90,13 +374,56 @@ async def handle_chat_start():
 
 @cl.on_message
 async def handle_message(message: cl.Message):
+    # Handler time next to the model's own latency shows where a slow reply came from
+    started = time.perf_counter()
+    try:
+        await reply_to(message)
+    finally:
+        provider_instance.metrics.observe("handle_message", time.perf_counter() - started)
+
+
+async def reply_to(message: cl.Message):
+    # A new message cancels the reply still streaming for the previous one
+    previous = cl.user_session.get("task")
+    if previous and not previous.done():
+        previous.cancel()
+    cl.user_session.set("task", asyncio.current_task())
+
     history = cl.user_session.get("history")
-    history.append({"role": "user", "content": message.content})
-    
-    result = await cl.make_async(Runner.run_sync)(agent, input=history)
-    response_text = result.final_output
+    history.append("user", message.content)
+
+    reply_stats["requests"] += 1
+    if reply_stats["requests"] % 100 == 0:
+        logger.info("Reply cache stats: %s", cache_stats())
+
+    # Replies only depend on the message itself on the first turn, so only those are cached
+    first_turn = len(history.messages) == 1 and not history.summary
+    response_text = intents.reply_for(message.content) if intents else None
+    if response_text is None and first_turn:
+        response_text = response_cache.get(message.content)
+    if response_text is not None:
+        await cl.Message(content=response_text).send()
+        history.append("assistant", response_text)
+        history.save()
+        return
+
+    reply_stats["model_calls"] += 1
+    reply = cl.Message(content="")
+    try:
+        response_text = await agent_runner.stream(history.as_input(), reply)
+    except asyncio.CancelledError:
+        # Keep whatever was streamed on screen, but not in the cache or the history
+        await reply.update()
+        raise
+
+    await reply.send()
+    if response_text is None:
+        return
+    if first_turn:
+        response_cache.put(message.content, response_text)
 
-    await cl.Message(content=response_text).send()
+    history.append("assistant", response_text)
+    history.save()
 
-    history.append({"role": "assistant", "content": response_text})
-    cl.user_session.set("history", history)
\ No newline at end of file
+    # Summarise after the reply has gone out, so it never adds to response time
+    history.schedule_compaction(summarizer)
\ No newline at end of file
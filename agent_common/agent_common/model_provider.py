@@ -0,0 +1,147 @@
+import os
+import threading
+import time
+from collections import defaultdict, deque
+
+from agents import AsyncOpenAI, OpenAIChatCompletionsModel
+from openai import DefaultAsyncHttpxClient
+import httpx
+
+DEFAULT_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/openai"
+DEFAULT_MODEL = "gemini-2.0-flash"
+
+
+# 💡 Encapsulation: Per-call latency, time to first token, tokens and errors, kept per name
+class CallMetrics:
+    SAMPLES = 2048  # Recent timings kept per name for percentiles
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = defaultdict(int)
+        self._errors = defaultdict(int)
+        self._tokens = defaultdict(lambda: {"input": 0, "output": 0})
+        self._timings = defaultdict(lambda: deque(maxlen=self.SAMPLES))  # (name, kind) -> seconds
+
+    def record(self, name: str, latency: float, ttft: float = None, input_tokens: int = 0,
+               output_tokens: int = 0, error: BaseException = None):
+        with self._lock:
+            self._calls[name] += 1
+            self._errors[name] += error is not None
+            self._tokens[name]["input"] += input_tokens
+            self._tokens[name]["output"] += output_tokens
+            self._timings[name, "latency"].append(latency)
+            if ttft is not None:
+                self._timings[name, "ttft"].append(ttft)
+
+    def observe(self, name: str, seconds: float):
+        """Times anything that isn't a model call, e.g. a whole message handler."""
+        with self._lock:
+            self._calls[name] += 1
+            self._timings[name, "latency"].append(seconds)
+
+    @staticmethod
+    def _percentile(values, q: float) -> float:
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            stats = {}
+            for name, calls in self._calls.items():
+                entry = {"calls": calls, "errors": self._errors[name],
+                         "error_rate": self._errors[name] / calls if calls else 0.0}
+                if name in self._tokens:
+                    entry["input_tokens"] = self._tokens[name]["input"]
+                    entry["output_tokens"] = self._tokens[name]["output"]
+                for kind in ("latency", "ttft"):
+                    values = self._timings.get((name, kind))
+                    if values:
+                        entry[f"{kind}_p50_ms"] = round(self._percentile(values, 0.5) * 1000, 1)
+                        entry[f"{kind}_p95_ms"] = round(self._percentile(values, 0.95) * 1000, 1)
+                stats[name] = entry
+            return stats
+
+    def to_prometheus(self) -> str:
+        """Renders the snapshot in the Prometheus text format."""
+        lines = []
+        for name, entry in self.snapshot().items():
+            label = f'{{name="{name}"}}'
+            lines.append(f"agent_calls_total{label} {entry['calls']}")
+            lines.append(f"agent_errors_total{label} {entry['errors']}")
+            if "input_tokens" in entry:
+                lines.append(f'agent_tokens_total{{name="{name}",kind="input"}} {entry["input_tokens"]}')
+                lines.append(f'agent_tokens_total{{name="{name}",kind="output"}} {entry["output_tokens"]}')
+            for key, value in entry.items():
+                if key.endswith("_ms"):
+                    metric, quantile = key[:-3].rsplit("_p", 1)
+                    lines.append(f'agent_{metric}_seconds{{name="{name}",quantile="0.{quantile}"}} {value / 1000}')
+        return "\n".join(lines) + "\n"
+
+
+# 💡 Inheritance + Polymorphism: Same model, but every call is timed and counted
+class InstrumentedChatCompletionsModel(OpenAIChatCompletionsModel):
+    def __init__(self, model: str, openai_client: AsyncOpenAI, metrics: CallMetrics):
+        super().__init__(model=model, openai_client=openai_client)
+        self.model_name = model
+        self.metrics = metrics
+
+    async def get_response(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await super().get_response(*args, **kwargs)
+        except Exception as error:
+            self.metrics.record(self.model_name, time.perf_counter() - started, error=error)
+            raise
+        usage = response.usage
+        self.metrics.record(self.model_name, time.perf_counter() - started,
+                            input_tokens=usage.input_tokens, output_tokens=usage.output_tokens)
+        return response
+
+    async def stream_response(self, *args, **kwargs):
+        started = time.perf_counter()
+        ttft = usage = None
+        try:
+            async for event in super().stream_response(*args, **kwargs):
+                if ttft is None and event.type == "response.output_text.delta":
+                    ttft = time.perf_counter() - started
+                elif event.type == "response.completed":
+                    usage = event.response.usage
+                yield event
+        except Exception as error:
+            self.metrics.record(self.model_name, time.perf_counter() - started, ttft, error=error)
+            raise
+        self.metrics.record(self.model_name, time.perf_counter() - started, ttft,
+                            usage.input_tokens if usage else 0, usage.output_tokens if usage else 0)
+
+
+# 💡 Encapsulation: One pooled client per process, pointed at Gemini or any OpenAI-compatible endpoint
+class ModelProvider:
+    _shared = None
+
+    def __init__(self, api_key: str = None, base_url: str = None, model: str = None,
+                 max_connections: int = 100, timeout: float = 60.0):
+        self.api_key = api_key or os.getenv("GEMINI_API_KEY")
+        # Overridable so a local stand-in server can be used
+        self.base_url = base_url or os.getenv("GEMINI_BASE_URL", DEFAULT_BASE_URL)
+        self.model = model or os.getenv("GEMINI_MODEL", DEFAULT_MODEL)
+        self.metrics = CallMetrics()
+        self.provider = AsyncOpenAI(
+            api_key=self.api_key,
+            base_url=self.base_url,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections // 4),
+                timeout=httpx.Timeout(timeout, connect=5.0),
+            ),
+        )
+
+    @classmethod
+    def shared(cls) -> "ModelProvider":
+        """The process-wide provider, so every agent reuses the same connections and metrics."""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def get_model(self):
+        return InstrumentedChatCompletionsModel(self.model, self.provider, self.metrics)
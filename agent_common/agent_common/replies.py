@@ -0,0 +1,87 @@
+import hashlib
+import re
+import sqlite3
+import time
+import unicodedata
+from collections import OrderedDict
+
+
+# 💡 Encapsulation: Remembers replies keyed on the normalised question plus a hash of the agent's instructions,
+# so changing the prompt automatically stops old answers from being served
+class ResponseCache:
+    def __init__(self, instructions: str, max_entries: int = 4096, ttl: float = 86400, path: str = None):
+        self.instructions_hash = hashlib.sha256(instructions.encode("utf-8")).hexdigest()[:16]
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (stored_at, reply), least recently used first
+        # Optional SQLite file so the cache survives restarts
+        self.db = sqlite3.connect(path) if path else None
+        if self.db:
+            self.db.execute("CREATE TABLE IF NOT EXISTS replies (key TEXT PRIMARY KEY, stored_at REAL, reply TEXT)")
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        text = unicodedata.normalize("NFKC", text).casefold()
+        return " ".join(re.findall(r"\w+", text))
+
+    def key(self, user_input: str) -> str:
+        return hashlib.sha256(f"{self.instructions_hash}\0{self.normalize(user_input)}".encode("utf-8")).hexdigest()
+
+    def get(self, user_input: str):
+        key = self.key(user_input)
+        entry = self._entries.get(key)
+        if entry is None and self.db:
+            entry = self.db.execute("SELECT stored_at, reply FROM replies WHERE key = ?", (key,)).fetchone()
+        if entry is None or time.time() - entry[0] > self.ttl:
+            self.misses += 1
+            return None
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, user_input: str, reply: str):
+        key = self.key(user_input)
+        entry = (time.time(), reply)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        if self.db:
+            with self.db:
+                self.db.execute("INSERT OR REPLACE INTO replies VALUES (?, ?, ?)", (key, *entry))
+
+
+# 💡 Abstraction: Recognises plain greetings and goodbyes locally so they never reach the model.
+# Anything it doesn't recognise goes to the model; repeated questions are absorbed by ResponseCache instead.
+class IntentClassifier:
+    GREETINGS = {"hi", "hii", "hello", "hey", "hiya", "howdy", "greetings", "hola", "yo", "salam", "salaam",
+                 "assalam", "asalam", "assalamualaikum", "aoa", "morning", "afternoon", "evening", "السلام", "سلام"}
+    GOODBYES = {"bye", "byebye", "goodbye", "hafiz", "cya", "farewell", "later", "night"}
+    # Words that may accompany a greeting or goodbye without changing its meaning
+    FILLER = {"o", "u", "alaikum", "alaykum", "عليكم", "good", "there", "everyone", "all", "friend", "dear", "allah",
+              "khuda", "see", "you", "take", "care", "thanks", "thank", "ok", "okay", "subhan", "kaladi", "and"}
+
+    def __init__(self, replies: dict):
+        # replies maps "greeting" / "goodbye" to a fixed answer; leave a key out to send it to the model
+        self.replies = replies
+        self.hits = 0
+
+    def classify(self, text: str):
+        words = set(ResponseCache.normalize(text).split())
+        greeting, goodbye = words & self.GREETINGS, words & self.GOODBYES
+        if (greeting and goodbye) or words - self.GREETINGS - self.GOODBYES - self.FILLER:
+            return None
+        if greeting:
+            return "greeting"
+        if goodbye:
+            return "goodbye"
+        return None
+
+    def reply_for(self, text: str):
+        reply = self.replies.get(self.classify(text))
+        if reply is not None:
+            self.hits += 1
+        return reply
@@ -1,7 +1,14 @@
+import csv
+import difflib
+import itertools
 import json
 import os
+import re
+import sqlite3
+import sys
 from abc import ABC, abstractmethod
 import uuid
+from collections import Counter
 
 # Abstraction: Defining an abstract base class for storage operations
 class LibraryStorage(ABC):
@@ -14,6 +21,86 @@ class LibraryStorage(ABC):
     @abstractmethod
     def save(self, data):
         pass
+    
+    # Polymorphism: Default single-record operations rewrite everything;
+    # backends that can persist one record at a time override these
+    def add(self, record):
+        data = list(self.load())
+        data.append(record)
+        self.save(data)
+    
+    def update(self, record):
+        self.save([record if item.get('id') == record['id'] else item for item in self.load()])
+    
+    def remove(self, book_id):
+        self.save([item for item in self.load() if item.get('id') != book_id])
+    
+    def add_many(self, records):
+        data = list(self.load())
+        data.extend(records)
+        self.save(data)
+    
+    # Polymorphism: Default paging walks the stream; backends with queries override these
+    def count(self):
+        return sum(1 for _ in self.load())
+    
+    def page(self, offset, limit):
+        return list(itertools.islice(self.load(), offset, offset + limit))
+    
+    def get(self, book_id):
+        return next((record for record in self.load() if record.get('id') == book_id), None)
+    
+    def facet_counts(self):
+        """Totals plus counts per genre, author and year, used to seed LibraryStats"""
+        counts = {'total': 0, 'read': 0, 'genre': Counter(), 'author': Counter(), 'year': Counter()}
+        for record in self.load():
+            counts['total'] += 1
+            counts['read'] += bool(record['read'])
+            counts['genre'][str(record['genre'])] += 1
+            counts['author'][record['author']] += 1
+            counts['year'][CatalogueIO.normalize_year(record['year'])] += 1
+        return counts
+    
+    # Abstraction: Search shared by every backend; fields are whitelisted here
+    SEARCH_FIELDS = ('title', 'author')
+    
+    def _search_terms(self, queries):
+        terms = {}
+        for field, query in queries.items():
+            if field not in self.SEARCH_FIELDS:
+                raise ValueError(f"Cannot search by {field}")
+            term = query.casefold().strip()
+            if term:
+                terms[field] = term
+        return terms
+    
+    @staticmethod
+    def _score(text, term, fuzzy):
+        """Whole word or phrase 3, word prefix 2, substring 1, close spelling 0.5"""
+        if re.search(r"\w", term):
+            if re.search(rf"\b{re.escape(term)}\b", text):
+                return 3.0
+            if re.search(rf"\b{re.escape(term)}", text):
+                return 2.0
+        if len(term) >= 3 and term in text:
+            return 1.0
+        if fuzzy and difflib.get_close_matches(term, re.findall(r"\w+", text), n=1, cutoff=0.75):
+            return 0.5
+        return 0.0
+    
+    # Polymorphism: Default search scans every record; indexed backends override it
+    def search(self, fuzzy=False, limit=None, **queries):
+        """Return records matching every given field query, best matches first"""
+        terms = self._search_terms(queries)
+        if not terms:
+            return []
+        matches = []
+        for record in self.load():
+            scores = [self._score(str(record[field]).casefold(), term, fuzzy) for field, term in terms.items()]
+            if all(scores):
+                matches.append((-sum(scores), str(record['title']).casefold(), len(matches), record))
+        matches.sort()
+        return [match[-1] for match in matches[:limit]]
 
 # Inheritance: FileStorage inherits from LibraryStorage
 class FileStorage(LibraryStorage):
@@ -24,29 +111,291 @@ class FileStorage(LibraryStorage):
     
     # Abstraction: Implementing abstract method from parent class
     def load(self):
-        if os.path.exists(self._filename):
-            with open(self._filename, 'r') as file:
-                return json.load(file)
-        return []
+        """Stream records one at a time instead of parsing the whole file into a list"""
+        if not os.path.exists(self._filename):
+            return
+        with open(self._filename, 'r') as file:
+            for position, record in enumerate(self._iter_records(file)):
+                if 'id' not in record:
+                    # Older files have no IDs; derive one that stays stable until the next save persists it
+                    key = f"{position}:{json.dumps(record, sort_keys=True)}"
+                    record['id'] = str(uuid.uuid5(uuid.NAMESPACE_URL, key))
+                yield record
+    
+    # Encapsulation: Private incremental parser for a top-level JSON array
+    _SEPARATORS = re.compile(r"[\s,]*")
+    
+    def _iter_records(self, file, chunk_size=1 << 16):
+        decoder = json.JSONDecoder()
+        buffer = file.read(chunk_size).lstrip()
+        if not buffer:
+            return
+        if not buffer.startswith('['):
+            raise ValueError(f"{self._filename} does not contain a JSON list")
+        position = 1
+        while True:
+            position = self._SEPARATORS.match(buffer, position).end()
+            if buffer.startswith(']', position):
+                return
+            try:
+                record, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                more = file.read(chunk_size)
+                if not more:
+                    raise
+                buffer = buffer[position:] + more
+                position = 0
+                continue
+            yield record
     
     # Abstraction: Implementing abstract method from parent class
     def save(self, data):
         with open(self._filename, 'w') as file:
             json.dump(data, file)
 
+# Inheritance: SQLiteStorage inherits from LibraryStorage
+class SQLiteStorage(LibraryStorage):
+    """SQLite storage that persists only the changed record on each edit"""
+    FIELDS = ('id', 'title', 'author', 'year', 'genre', 'read', 'special_note')
+    SCHEMA_VERSION = 1
+    # An explicit integer key keeps rowids stable across VACUUM so the FTS5 tables can point at them.
+    # book_words answers word and prefix queries, book_grams substring queries.
+    SCHEMA = (
+        "CREATE TABLE books (seq INTEGER PRIMARY KEY, id TEXT NOT NULL UNIQUE, title TEXT, author TEXT, "
+        "year, genre TEXT, read INTEGER, special_note TEXT)",
+        "CREATE VIRTUAL TABLE book_words USING fts5(title, author, content='books', content_rowid='seq', "
+        "tokenize='unicode61 remove_diacritics 0', prefix='2 3')",
+        "CREATE VIRTUAL TABLE book_grams USING fts5(title, author, content='books', content_rowid='seq', "
+        "tokenize='trigram')",
+        "CREATE VIRTUAL TABLE book_vocabulary USING fts5vocab(book_words, 'col')",
+    )
+    SEARCH_TABLES = ('book_words', 'book_grams')
+    
+    def __init__(self, filename='library.db', batch_size=1000):
+        # Encapsulation: Connection and batch size are implementation details
+        self._filename = filename
+        self._batch_size = batch_size
+        self._conn = sqlite3.connect(filename)
+        self._migrate()
+    
+    # Encapsulation: Private schema setup, upgrading databases written before the search tables existed
+    def _migrate(self):
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] >= self.SCHEMA_VERSION:
+            return
+        columns = ', '.join(self.FIELDS)
+        legacy = self._conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'books'").fetchone()
+        statements = list(self.SCHEMA)
+        if legacy:
+            statements = (["ALTER TABLE books RENAME TO legacy_books"] + statements + [
+                f"INSERT INTO books ({columns}) SELECT {columns} FROM legacy_books ORDER BY rowid",
+                "DROP TABLE legacy_books"
+            ])
+        statements.append(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        with self._conn:
+            self._conn.execute("BEGIN")
+            for statement in statements:
+                self._conn.execute(statement)
+            self._index_rows("seq > ?", (0,))
+    
+    # Encapsulation: The write methods keep the search tables in step themselves;
+    # one set-based insert per batch is several times faster than a trigger per row
+    def _index_rows(self, where, params):
+        for table in self.SEARCH_TABLES:
+            self._conn.execute(
+                f"INSERT INTO {table} (rowid, title, author) SELECT seq, title, author FROM books WHERE {where}",
+                params
+            )
+    
+    def _unindex_rows(self, where, params):
+        for table in self.SEARCH_TABLES:
+            self._conn.execute(
+                f"INSERT INTO {table} ({table}, rowid, title, author) "
+                f"SELECT 'delete', seq, title, author FROM books WHERE {where}",
+                params
+            )
+    
+    # Encapsulation: Private helpers converting between rows and records
+    def _to_row(self, record):
+        return (
+            record['id'], record['title'], record['author'], record['year'],
+            record['genre'], int(bool(record['read'])), record.get('special_note')
+        )
+    
+    def _to_record(self, row):
+        record = dict(zip(self.FIELDS, row))
+        record['read'] = bool(record['read'])
+        if record['special_note'] is None:
+            del record['special_note']
+        return record
+    
+    # Abstraction: Implementing abstract method from parent class
+    def load(self):
+        """Stream records in batches instead of reading the whole table at once"""
+        cursor = self._conn.execute(f"SELECT {', '.join(self.FIELDS)} FROM books ORDER BY seq")
+        while True:
+            rows = cursor.fetchmany(self._batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield self._to_record(row)
+    
+    # Abstraction: Implementing abstract method from parent class
+    def save(self, data):
+        with self._conn:
+            for table in self.SEARCH_TABLES:
+                self._conn.execute(f"INSERT INTO {table} ({table}) VALUES ('delete-all')")
+            self._conn.execute("DELETE FROM books")
+            self._conn.executemany(
+                self._INSERT,
+                (self._to_row(record) for record in data)
+            )
+            self._index_rows("seq > ?", (0,))
+    
+    # Polymorphism: Counting and paging in SQL so only the requested rows are read
+    def count(self):
+        return self._conn.execute("SELECT COUNT(*) FROM books").fetchone()[0]
+    
+    def page(self, offset, limit):
+        rows = self._conn.execute(
+            f"SELECT {', '.join(self.FIELDS)} FROM books ORDER BY seq LIMIT ? OFFSET ?", (limit, offset)
+        )
+        return [self._to_record(row) for row in rows]
+    
+    def get(self, book_id):
+        row = self._conn.execute(f"SELECT {', '.join(self.FIELDS)} FROM books WHERE id = ?", (book_id,)).fetchone()
+        return self._to_record(row) if row else None
+    
+    def facet_counts(self):
+        """Aggregate in SQL so the counters are seeded without reading every row into Python"""
+        total, read = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(read), 0) FROM books").fetchone()
+        counts = {'total': total, 'read': read, 'genre': Counter(), 'author': Counter(), 'year': Counter()}
+        for value, count in self._conn.execute("SELECT genre, COUNT(*) FROM books GROUP BY genre"):
+            counts['genre'][str(value)] += count
+        for value, count in self._conn.execute("SELECT author, COUNT(*) FROM books GROUP BY author"):
+            counts['author'][value] += count
+        for value, count in self._conn.execute("SELECT year, COUNT(*) FROM books GROUP BY year"):
+            counts['year'][CatalogueIO.normalize_year(value)] += count
+        return counts
+    
+    # Polymorphism: Overriding the full-rewrite defaults with single-row statements
+    _INSERT = f"INSERT INTO books ({', '.join(FIELDS)}) VALUES ({', '.join('?' * len(FIELDS))})"
+    
+    def add(self, record):
+        with self._conn:
+            seq = self._conn.execute(self._INSERT, self._to_row(record)).lastrowid
+            self._index_rows("seq = ?", (seq,))
+    
+    def add_many(self, records):
+        """Insert a batch of records in a single transaction"""
+        with self._conn:
+            last = self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM books").fetchone()[0]
+            self._conn.executemany(
+                self._INSERT,
+                (self._to_row(record) for record in records)
+            )
+            self._index_rows("seq > ?", (last,))
+    
+    def update(self, record):
+        with self._conn:
+            self._unindex_rows("id = ?", (record['id'],))
+            self._conn.execute(
+                "UPDATE books SET title = ?, author = ?, year = ?, genre = ?, read = ?, special_note = ? "
+                "WHERE id = ?",
+                self._to_row(record)[1:] + (record['id'],)
+            )
+            self._index_rows("id = ?", (record['id'],))
+    
+    def remove(self, book_id):
+        with self._conn:
+            self._unindex_rows("id = ?", (book_id,))
+            self._conn.execute("DELETE FROM books WHERE id = ?", (book_id,))
+    
+    # Polymorphism: Searching the FTS5 tables instead of scanning every record
+    @staticmethod
+    def _phrase(text):
+        return '"' + text.replace('"', '""') + '"'
+    
+    def _close_terms(self, field, term):
+        # Only words sharing the first letter are compared, keeping the vocabulary scan small
+        rows = self._conn.execute(
+            "SELECT DISTINCT term FROM book_vocabulary WHERE col = ? AND term >= ? AND term < ?",
+            (field, term[0], term[0] + "\uffff")
+        )
+        return difflib.get_close_matches(term, [row[0] for row in rows], n=5, cutoff=0.75)
+    
+    def search(self, fuzzy=False, limit=None, **queries):
+        """Return records matching every given field query, best matches first"""
+        terms = self._search_terms(queries)
+        if not terms:
+            return []
+        tables, params = [], {'limit': -1 if limit is None else limit}
+        for n, (field, term) in enumerate(terms.items()):
+            branches = []
+            if re.search(r"\w", term):
+                branches.append(f"SELECT rowid AS seq, 3.0 AS score FROM book_words WHERE book_words MATCH :word{n}")
+                branches.append(f"SELECT rowid, 2.0 FROM book_words WHERE book_words MATCH :prefix{n}")
+                params[f'word{n}'] = f"{field} : {self._phrase(term)}"
+                params[f'prefix{n}'] = f"{field} : {self._phrase(term)} *"
+            if len(term) >= 3:
+                branches.append(f"SELECT rowid, 1.0 FROM book_grams WHERE book_grams MATCH :substring{n}")
+                params[f'substring{n}'] = f"{field} : {self._phrase(term)}"
+            close = self._close_terms(field, term) if fuzzy and re.fullmatch(r"\w+", term) else []
+            if close:
+                branches.append(f"SELECT rowid, 0.5 FROM book_words WHERE book_words MATCH :close{n}")
+                params[f'close{n}'] = f"{field} : (" + " OR ".join(map(self._phrase, close)) + ")"
+            if not branches:
+                return []
+            tables.append(f"field{n} AS (SELECT seq, MAX(score) AS score FROM ({' UNION ALL '.join(branches)}) GROUP BY seq)")
+        joins = ''.join(f" JOIN field{n} USING (seq)" for n in range(1, len(tables)))
+        score = ' + '.join(f"field{n}.score" for n in range(len(tables)))
+        rows = self._conn.execute(
+            f"WITH {', '.join(tables)} "
+            f"SELECT {', '.join('books.' + field for field in self.FIELDS)} FROM field0{joins} JOIN books USING (seq) "
+            f"ORDER BY {score} DESC, lower(books.title) LIMIT :limit",
+            params
+        )
+        return [self._to_record(row) for row in rows]
+    
+    def is_empty(self):
+        return self._conn.execute("SELECT 1 FROM books LIMIT 1").fetchone() is None
+    
+    def close(self):
+        self._conn.close()
+
 # Encapsulation: Book class encapsulates book-related data and behavior
 class Book:
     """Base class for books demonstrating encapsulation"""
-    def __init__(self, title, author, year, genre, read=False):
+    # Encapsulation: __slots__ removes the per-instance __dict__ so large catalogues stay compact
+    __slots__ = ('_id', '_title', '_author', '_year', '_genre', '_read')
+    
+    def __init__(self, title, author, year, genre, read=False, book_id=None):
         # Encapsulation: Using protected attributes to hide internal state
-        self._id = str(uuid.uuid4())
+        # IDs are kept stable across loads so storage can address single records
+        self._id = book_id or str(uuid.uuid4())
         self._title = title
         self._author = author
         self._year = year
         self._genre = genre
         self._read = read
     
+    # Polymorphism: Factory choosing the book type from a storage record
+    @staticmethod
+    def from_record(record):
+        """Build a Book or SpecialBook from a storage record"""
+        # Authors and genres repeat across many books, so share one string per value
+        author = sys.intern(record['author'])
+        genre = sys.intern(str(record['genre']))
+        year = CatalogueIO.normalize_year(record['year'])
+        if 'special_note' in record:
+            return SpecialBook(record['title'], author, year, genre,
+                               record['read'], record['special_note'], record.get('id'))
+        return Book(record['title'], author, year, genre, record['read'], record.get('id'))
+    
     # Encapsulation: Using property decorators for controlled access to attributes
+    @property
+    def id(self):
+        return self._id
+    
     @property
     def title(self):
         return self._title
@@ -55,6 +404,14 @@ class Book:
     def author(self):
         return self._author
     
+    @property
+    def year(self):
+        return self._year
+    
+    @property
+    def genre(self):
+        return self._genre
+    
     @property
     def read(self):
         return self._read
@@ -74,9 +431,11 @@ class Book:
 # Polymorphism: Overrides get_details method
 class SpecialBook(Book):
     """Derived class demonstrating inheritance and polymorphism"""
-    def __init__(self, title, author, year, genre, read=False, special_note=""):
+    __slots__ = ('_special_note',)
+    
+    def __init__(self, title, author, year, genre, read=False, special_note="", book_id=None):
         # Inheritance: Calling parent class constructor
-        super().__init__(title, author, year, genre, read)
+        super().__init__(title, author, year, genre, read, book_id)
         # Encapsulation: Protected attribute for special note
         self._special_note = special_note
     
@@ -85,59 +444,265 @@ class SpecialBook(Book):
         base_details = super().get_details()
         return f"{base_details} [Special Note: {self._special_note}]"
 
+# Abstraction: CatalogueIO hides the details of each import/export format
+class CatalogueIO:
+    """Streaming readers/writers for CSV, JSONL and MARC mnemonic (.mrk) catalogues"""
+    FIELDS = ('title', 'author', 'year', 'genre', 'read', 'special_note')
+    # MARC tags mapped to book fields (100 main author, 245 title, 260/264 date, 650 subject)
+    MARC_TAGS = {'100': 'author', '245': 'title', '260': 'year', '264': 'year', '650': 'genre'}
+    
+    @staticmethod
+    def normalize_year(year):
+        """Store years as int whatever form they arrive in ('1965', 1965, 'c1965.')"""
+        if isinstance(year, int) or year is None:
+            return year
+        match = re.search(r"\d{1,4}", str(year))
+        return int(match.group()) if match else None
+    
+    @classmethod
+    def normalize(cls, raw):
+        """Validate and clean one imported record; raises ValueError if unusable"""
+        title = str(raw.get('title') or '').strip()
+        author = str(raw.get('author') or '').strip()
+        if not title or not author:
+            raise ValueError("title and author are required")
+        read = raw.get('read', False)
+        if not isinstance(read, bool):
+            read = str(read).strip().lower() in ('yes', 'true', '1', 'y')
+        record = {
+            'title': title,
+            'author': author,
+            'year': cls.normalize_year(raw.get('year')),
+            'genre': str(raw.get('genre') or '').strip(),
+            'read': read
+        }
+        if raw.get('special_note'):
+            record['special_note'] = str(raw['special_note']).strip()
+        return record
+    
+    @staticmethod
+    def dedupe_key(record):
+        return (record['title'].casefold(), record['author'].casefold(), record['year'])
+    
+    @classmethod
+    def read(cls, path):
+        """Yield raw records from a file, picking the format from its extension"""
+        extension = os.path.splitext(path)[1].lower()
+        with open(path, 'r', encoding='utf-8', newline='') as file:
+            if extension == '.csv':
+                yield from csv.DictReader(file)
+            elif extension in ('.jsonl', '.ndjson'):
+                for line in file:
+                    if line.strip():
+                        yield json.loads(line)
+            elif extension == '.mrk':
+                yield from cls._read_marc(file)
+            else:
+                raise ValueError(f"Unsupported import format: {extension}")
+    
+    @classmethod
+    def _read_marc(cls, file):
+        record = {}
+        for line in file:
+            line = line.rstrip('\n')
+            if line.startswith('=LDR') or not line.strip():
+                # A leader or blank line starts the next record
+                if record:
+                    yield record
+                record = {}
+                continue
+            tag = line[1:4]
+            field = cls.MARC_TAGS.get(tag)
+            if field and field not in record:
+                code = 'c' if field == 'year' else 'a'
+                match = re.search(rf"\${code}([^$]*)", line)
+                if match:
+                    # Drop ISBD punctuation, keeping the full stop that ends an author's initials
+                    value = match.group(1).strip(' /:;,=')
+                    record[field] = value if field == 'author' else value.rstrip('.')
+        if record:
+            yield record
+    
+    @classmethod
+    def write(cls, path, records):
+        """Stream records out to CSV or JSONL"""
+        extension = os.path.splitext(path)[1].lower()
+        with open(path, 'w', encoding='utf-8', newline='') as file:
+            if extension == '.csv':
+                writer = csv.DictWriter(file, fieldnames=('id',) + cls.FIELDS)
+                writer.writeheader()
+                writer.writerows(records)
+            elif extension in ('.jsonl', '.ndjson'):
+                for record in records:
+                    file.write(json.dumps(record) + '\n')
+            else:
+                raise ValueError(f"Unsupported export format: {extension}")
+
+# Encapsulation: LibraryStats keeps counters that are updated instead of recounted
+class LibraryStats:
+    """Totals and facet counts maintained incrementally on every library change"""
+    FACETS = ('genre', 'author', 'decade')
+    
+    def __init__(self):
+        # Encapsulation: Protected counters
+        self._total = 0
+        self._read = 0
+        self._facets = {facet: Counter() for facet in self.FACETS}
+    
+    @staticmethod
+    def _decade(year):
+        try:
+            return int(str(year).strip()[:4]) // 10 * 10
+        except ValueError:
+            return None
+    
+    def _facet_values(self, book):
+        return {'genre': book.genre, 'author': book.author, 'decade': self._decade(book.year)}
+    
+    def _count(self, book, step):
+        self._total += step
+        self._read += step if book.read else 0
+        for facet, value in self._facet_values(book).items():
+            counter = self._facets[facet]
+            counter[value] += step
+            if counter[value] <= 0:
+                del counter[value]
+    
+    def load(self, counts):
+        """Seed the counters from storage totals instead of visiting every book"""
+        self._total, self._read = counts['total'], counts['read']
+        self._facets['genre'].update(counts['genre'])
+        self._facets['author'].update(counts['author'])
+        for year, count in counts['year'].items():
+            self._facets['decade'][self._decade(year)] += count
+    
+    def add(self, book):
+        self._count(book, 1)
+    
+    def remove(self, book):
+        self._count(book, -1)
+    
+    def read_changed(self, was_read, is_read):
+        self._read += int(is_read) - int(was_read)
+    
+    def summary(self):
+        return {
+            'total': self._total,
+            'read': self._read,
+            'unread': self._total - self._read,
+            'read_ratio': self._read / self._total if self._total else 0.0
+        }
+    
+    def facet(self, name, limit=None):
+        if name not in self._facets:
+            raise ValueError(f"Unknown facet {name}")
+        # With a limit, most_common picks the top entries with a heap instead of sorting them all
+        return dict(self._facets[name].most_common(limit))
+
 # Encapsulation: LibraryManager encapsulates all library operations
 class LibraryManager:
     """Main class managing the library operations"""
     def __init__(self, storage: LibraryStorage):
         # Encapsulation: Using composition to hide storage implementation
         self._storage = storage
-        # Encapsulation: Private books list
-        self._books = self._load_books()
+        # Encapsulation: Private counters seeded from storage; books themselves are
+        # only materialised when an operation needs them
+        self._stats = LibraryStats()
+        self._stats.load(self._storage.facet_counts())
     
-    # Encapsulation: Private method for loading books
-    def _load_books(self):
+    # Encapsulation: Private method for loading a single book
+    def _load_book(self, book_id):
         """Private method demonstrating encapsulation"""
-        raw_data = self._storage.load()
-        books = []
-        for book_data in raw_data:
-            if 'special_note' in book_data:
-                # Polymorphism: Creating different book types based on data
-                book = SpecialBook(
-                    book_data['title'],
-                    book_data['author'],
-                    book_data['year'],
-                    book_data['genre'],
-                    book_data['read'],
-                    book_data['special_note']
-                )
-            else:
-                book = Book(
-                    book_data['title'],
-                    book_data['author'],
-                    book_data['year'],
-                    book_data['genre'],
-                    book_data['read']
-                )
-            books.append(book)
-        return books
-    
-    # Encapsulation: Private method for saving books
-    def _save_books(self):
+        record = self._storage.get(book_id)
+        if record is None:
+            raise KeyError(book_id)
+        return Book.from_record(record)
+    
+    # Encapsulation: Private method converting a book into a storage record
+    def _to_record(self, book):
         """Private method demonstrating encapsulation"""
-        books_data = []
-        for book in self._books:
-            book_data = {
-                'title': book.title,
-                'author': book.author,
-                'year': book._year,
-                'genre': book._genre,
-                'read': book.read
-            }
-            # Polymorphism: Handling different book types
-            if isinstance(book, SpecialBook):
-                book_data['special_note'] = book._special_note
-            books_data.append(book_data)
-        self._storage.save(books_data)
+        book_data = {
+            'id': book.id,
+            'title': book.title,
+            'author': book.author,
+            'year': book._year,
+            'genre': book._genre,
+            'read': book.read
+        }
+        # Polymorphism: Handling different book types
+        if isinstance(book, SpecialBook):
+            book_data['special_note'] = book._special_note
+        return book_data
+    
+    # Programmatic API: usable by other tools without going through input()
+    def create_book(self, title, author, year, genre, read=False, special_note=None):
+        """Add a book and return it"""
+        year = CatalogueIO.normalize_year(year)
+        # Polymorphism: Creating different book types based on parameter
+        if special_note is not None:
+            book = SpecialBook(title, author, year, genre, read, special_note)
+        else:
+            book = Book(title, author, year, genre, read)
+        
+        self._stats.add(book)
+        # Only the new record is written, not the whole collection
+        self._storage.add(self._to_record(book))
+        return book
+    
+    def import_books(self, path):
+        """Validate, normalise and deduplicate a catalogue file, then store it in one batch"""
+        # Only the dedupe keys of stored books are kept, streamed from storage
+        seen = {
+            CatalogueIO.dedupe_key({**record, 'year': CatalogueIO.normalize_year(record['year'])})
+            for record in self._storage.load()
+        }
+        new_books, duplicates, errors = [], 0, []
+        for line_number, raw in enumerate(CatalogueIO.read(path), start=1):
+            try:
+                record = CatalogueIO.normalize(raw)
+            except ValueError as error:
+                errors.append(f"record {line_number}: {error}")
+                continue
+            key = CatalogueIO.dedupe_key(record)
+            if key in seen:
+                duplicates += 1
+                continue
+            seen.add(key)
+            new_books.append(Book.from_record(record))
+        
+        self._storage.add_many(self._to_record(book) for book in new_books)
+        for book in new_books:
+            self._stats.add(book)
+        return {'imported': len(new_books), 'duplicates': duplicates, 'errors': errors}
+    
+    def export_books(self, path):
+        """Write the catalogue to CSV or JSONL, streaming from storage"""
+        records = ({**record, 'year': CatalogueIO.normalize_year(record['year'])} for record in self._storage.load())
+        CatalogueIO.write(path, records)
+    
+    def delete_books(self, title):
+        """Remove every book with the given title and return how many were removed"""
+        removed = [book for book in self.find_books(title=title) if book.title.lower() == title.lower()]
+        for book in removed:
+            self._stats.remove(book)
+            self._storage.remove(book.id)
+        return len(removed)
+    
+    def set_read(self, book_id, read=True):
+        """Mark a book as read or unread"""
+        book = self._load_book(book_id)
+        if book.read != read:
+            self._stats.read_changed(book.read, read)
+            book.read = read
+            self._storage.update(self._to_record(book))
+        return book
+    
+    def get_statistics(self):
+        return self._stats.summary()
+    
+    def get_facets(self, name, limit=None):
+        """Counts per genre, author or decade, most common first (only the top `limit` if given)"""
+        return self._stats.facet(name, limit)
     
     def add_book(self, is_special=False):
         """Method to add new books"""
@@ -146,38 +711,70 @@ class LibraryManager:
         year = input("Enter publication year: ")
         genre = input("Enter genre: ")
         read = input("Have you read this book? (yes/no): ").lower() == 'yes'
+        special_note = input("Enter special note: ") if is_special else None
         
-        # Polymorphism: Creating different book types based on parameter
-        if is_special:
-            special_note = input("Enter special note: ")
-            book = SpecialBook(title, author, year, genre, read, special_note)
-        else:
-            book = Book(title, author, year, genre, read)
-        
-        self._books.append(book)
-        self._save_books()
+        self.create_book(title, author, year, genre, read, special_note)
         print(f'Book "{title}" added successfully!')
     
     def remove_book(self):
         """Method to remove books"""
         title = input("Enter the title of the book to remove: ")
-        initial_length = len(self._books)
-        self._books = [book for book in self._books if book.title.lower() != title.lower()]
-        if len(self._books) < initial_length:
-            self._save_books()
+        if self.delete_books(title):
             print(f'Book "{title}" removed successfully!')
         else:
             print(f'Book "{title}" not found.')
     
+    def import_catalogue(self):
+        """Method to bulk import books"""
+        path = input("Enter the file to import (.csv, .jsonl or .mrk): ")
+        try:
+            result = self.import_books(path)
+        except (OSError, ValueError) as error:
+            print(f"Import failed: {error}")
+            return
+        print(f"Imported {result['imported']} books, skipped {result['duplicates']} duplicates.")
+        for error in result['errors'][:10]:
+            print(f"  Skipped {error}")
+    
+    def export_catalogue(self):
+        """Method to export all books"""
+        path = input("Enter the file to export to (.csv or .jsonl): ")
+        try:
+            self.export_books(path)
+        except (OSError, ValueError) as error:
+            print(f"Export failed: {error}")
+            return
+        print(f"Catalogue exported to {path}")
+    
+    def mark_book_read(self):
+        """Method to mark books as read"""
+        title = input("Enter the title of the book you have read: ")
+        matches = [book for book in self.find_books(title=title) if book.title.lower() == title.lower()]
+        if not matches:
+            print(f'Book "{title}" not found.')
+            return
+        for book in matches:
+            self.set_read(book.id, True)
+        print(f'Book "{title}" marked as read!')
+    
+    def find_books(self, fuzzy=False, limit=None, **queries):
+        """Search by any combination of fields, e.g. find_books(title="dune", author="herb")"""
+        return [Book.from_record(record) for record in self._storage.search(fuzzy=fuzzy, limit=limit, **queries)]
+    
     def search_books(self):
         """Method to search books"""
-        search_by = input("Search by title or author: ").lower()
-        if search_by not in ['title', 'author']:
+        search_by = input("Search by title, author or both: ").lower()
+        if search_by not in ['title', 'author', 'both']:
             print("Invalid search criteria.")
             return
         
-        search_term = input(f"Enter the {search_by}: ").lower()
-        results = [book for book in self._books if search_term in getattr(book, search_by).lower()]
+        fields = ['title', 'author'] if search_by == 'both' else [search_by]
+        queries = {field: input(f"Enter the {field}: ") for field in fields}
+        results = self.find_books(**queries)
+        if not results:
+            results = self.find_books(fuzzy=True, **queries)
+            if results:
+                print("No exact matches. Closest matches:")
         
         if results:
             # Polymorphism: Calling get_details which could be from Book or SpecialBook
@@ -186,26 +783,37 @@ class LibraryManager:
         else:
             print("No matching books found.")
     
-    def display_all_books(self):
-        """Method to display all books"""
-        if self._books:
-            # Polymorphism: Calling get_details which could be from different book types
-            for book in self._books:
-                print(book.get_details())
-        else:
+    def display_all_books(self, page_size=20):
+        """Method to display all books, one page at a time"""
+        total = self._storage.count()
+        if not total:
             print("No books in the library.")
+            return
+        for offset in range(0, total, page_size):
+            # Only the rows on this page are read from storage and turned into books
+            for record in self._storage.page(offset, page_size):
+                # Polymorphism: Calling get_details which could be from different book types
+                print(Book.from_record(record).get_details())
+            shown = min(offset + page_size, total)
+            if shown < total and input(f"-- {shown} of {total} shown. Press Enter for more or q to stop: ").lower() == 'q':
+                break
     
     def display_statistics(self):
         """Method to display library statistics"""
-        total_books = len(self._books)
-        read_books = len([book for book in self._books if book.read])
-        percentage_read = (read_books / total_books * 100) if total_books > 0 else 0
-        print(f"Total Books: {total_books}")
-        print(f"Percentage Read: {percentage_read:.2f}%")
+        stats = self.get_statistics()
+        print(f"Total Books: {stats['total']}")
+        print(f"Percentage Read: {stats['read_ratio'] * 100:.2f}%")
+        for facet in LibraryStats.FACETS:
+            top = self.get_facets(facet, limit=5).items()
+            if top:
+                print(f"Top {facet}s: " + ", ".join(f"{value} ({count})" for value, count in top))
 
 def main():
-    # Abstraction: Using FileStorage through abstract interface
-    storage = FileStorage()
+    # Abstraction: Using SQLiteStorage through abstract interface
+    storage = SQLiteStorage()
+    # One-time migration of the legacy JSON file into the database
+    if storage.is_empty() and os.path.exists('library.txt'):
+        storage.save(FileStorage('library.txt').load())
     # Encapsulation: LibraryManager hides implementation details
     library = LibraryManager(storage)
     
@@ -217,7 +825,10 @@ def main():
         print("4. Search Book")
         print("5. Display All Books")
         print("6. Display Statistics")
-        print("7. Exit")
+        print("7. Mark Book as Read")
+        print("8. Import Books")
+        print("9. Export Books")
+        print("10. Exit")
         
         choice = input("Enter your choice: ")
         
@@ -234,6 +845,12 @@ def main():
         elif choice == '6':
             library.display_statistics()
         elif choice == '7':
+            library.mark_book_read()
+        elif choice == '8':
+            library.import_catalogue()
+        elif choice == '9':
+            library.export_catalogue()
+        elif choice == '10':
             print("Exiting the Library Manager.")
             break
         else:
@@ -1,55 +1,209 @@
+import argparse
+import asyncio
+import json
 import os
+import random
+import time
 from dotenv import load_dotenv
-from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel
+from agents import Agent, Runner
+from openai import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+from agent_common.replies import IntentClassifier, ResponseCache
+from agent_common.model_provider import ModelProvider
 
 # Load environment variables from .env file
 load_dotenv()
 
 
-# 💡 Encapsulation: All model setup logic is wrapped inside a class
-class ModelProvider:
-    def __init__(self, api_key: str):
-        self.api_key = api_key
-        self.provider = AsyncOpenAI(
-            api_key=self.api_key,
-            base_url="https://generativelanguage.googleapis.com/v1beta/openai"
-        )
-
-    def get_model(self):
-        return OpenAIChatCompletionsModel(
-            model="gemini-2.0-flash",
-            openai_client=self.provider
-        )
-
-
 # 💡 Abstraction: User interacts with this class instead of handling low-level agent setup
 class GreetingAgentApp:
-    def __init__(self, model):
+    GREETING = "Salam from Subhan Kaladi"
+    GOODBYE = "Allah Hafiz from Subhan Kaladi"
+    REFUSAL = "Subhan is here just for greeting, I can't answer anything else, sorry."
+
+    def __init__(self, model, use_local_intents: bool = True, cache_path: str = None):
         self.agent = Agent(
             name="Greeting Agent",
             instructions=(
                 "You are a Greeting Agent. Your task is to greet the user with a friendly message. "
-                "When someone says hi, you reply back with 'Salam from Subhan Kaladi'. "
-                "If someone says bye, then say 'Allah Hafiz from Subhan Kaladi'. "
-                "If someone asks something else, then say 'Subhan is here just for greeting, I can't answer anything else, sorry.'"
+                f"When someone says hi, you reply back with '{self.GREETING}'. "
+                f"If someone says bye, then say '{self.GOODBYE}'. "
+                f"If someone asks something else, then say '{self.REFUSAL}'"
             ),
             model=model
         )
+        self.cache = ResponseCache(self.agent.instructions, path=cache_path)
+        # Only greetings and goodbyes are answered locally; repeated refusals are served from the cache
+        self.intents = IntentClassifier(
+            {"greeting": self.GREETING, "goodbye": self.GOODBYE}
+        ) if use_local_intents else None
+        self.requests = 0
 
     # 💡 Polymorphism: You can later add more types of agents by overriding this method
     def get_response(self, user_input: str) -> str:
-        result = Runner.run_sync(self.agent, user_input)
-        return result.final_output
+        reply, source = self.lookup(user_input)
+        if reply is None:
+            result = Runner.run_sync(self.agent, user_input)
+            reply = result.final_output
+            self.cache.put(user_input, reply)
+        return reply
+
+    def lookup(self, user_input: str):
+        """Answers without the model when possible: returns (reply or None, "intent" / "cache" / "model")."""
+        self.requests += 1
+        reply = self.intents.reply_for(user_input) if self.intents else None
+        if reply is not None:
+            return reply, "intent"
+        reply = self.cache.get(user_input)
+        return reply, "cache" if reply is not None else "model"
+
+    async def ask_model(self, user_input: str):
+        """Runs the agent on the async runner and returns (reply, token usage)."""
+        result = await Runner.run(self.agent, user_input)
+        usage = {"requests": 0, "input_tokens": 0, "output_tokens": 0, "total_tokens": 0}
+        for response in result.raw_responses:
+            for name in usage:
+                usage[name] += getattr(response.usage, name)
+        self.cache.put(user_input, result.final_output)
+        return result.final_output, usage
+
+    def cache_stats(self) -> dict:
+        intent_hits = self.intents.hits if self.intents else 0
+        model_calls = self.requests - intent_hits - self.cache.hits
+        return {
+            "requests": self.requests,
+            "intent_hits": intent_hits,
+            "cache_hits": self.cache.hits,
+            "model_calls": model_calls,
+            "hit_rate": (self.requests - model_calls) / self.requests if self.requests else 0.0,
+        }
+
+
+# 💡 Encapsulation: Token bucket that spaces out model calls to a steady rate
+class RateLimiter:
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+# 💡 Encapsulation: Retries transient API failures with exponential backoff and jitter
+class RetryPolicy:
+    RETRYABLE = (APIConnectionError, APITimeoutError, InternalServerError, RateLimitError)
+
+    def __init__(self, attempts: int = 4, base_delay: float = 0.5, max_delay: float = 8.0):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+# 💡 Abstraction: Runs a JSONL file of prompts through the app concurrently and records each outcome
+class BatchRunner:
+    def __init__(self, app: GreetingAgentApp, concurrency: int = 16, rate: float = 10.0,
+                 retry: RetryPolicy = None):
+        self.app = app
+        self.limiter = RateLimiter(rate, burst=concurrency)
+        self.retry = retry or RetryPolicy()
+        self._slots = asyncio.Semaphore(concurrency)
+
+    async def run_one(self, case_id, prompt: str) -> dict:
+        async with self._slots:
+            started = time.perf_counter()
+            reply, source = self.app.lookup(prompt)
+            record = {"id": case_id, "prompt": prompt, "output": reply, "source": source,
+                      "usage": None, "error": None, "attempts": 0}
+            # Intent and cache hits never reach the model, so they skip the rate limiter too
+            while reply is None and record["attempts"] < self.retry.attempts:
+                await self.limiter.acquire()
+                record["attempts"] += 1
+                try:
+                    reply, record["usage"] = await self.app.ask_model(prompt)
+                    record.update(output=reply, error=None)
+                except self.retry.RETRYABLE as error:
+                    record["error"] = f"{type(error).__name__}: {error}"
+                    if record["attempts"] < self.retry.attempts:
+                        await asyncio.sleep(self.retry.delay(record["attempts"] - 1))
+                except Exception as error:
+                    record["error"] = f"{type(error).__name__}: {error}"
+                    break
+            record["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            return record
+
+    async def run(self, input_path: str, output_path: str) -> dict:
+        with open(input_path, encoding="utf-8") as file:
+            cases = [json.loads(line) for line in file if line.strip()]
+        tasks = [
+            asyncio.create_task(self.run_one(case.get("id", number), case["prompt"]))
+            for number, case in enumerate(cases, 1)
+        ]
+        latencies, errors = [], 0
+        tokens = 0
+        # Results are written as they finish, so a huge run never holds every output in memory
+        with open(output_path, "w", encoding="utf-8") as out:
+            for finished in asyncio.as_completed(tasks):
+                record = await finished
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                latencies.append(record["latency_ms"])
+                errors += record["error"] is not None
+                tokens += (record["usage"] or {}).get("total_tokens", 0)
+        latencies.sort()
+        return {
+            "cases": len(cases),
+            "errors": errors,
+            "p50_ms": latencies[len(latencies) // 2] if latencies else 0,
+            "p95_ms": latencies[int(len(latencies) * 0.95)] if latencies else 0,
+            "total_tokens": tokens,
+            **self.app.cache_stats(),
+        }
 
 
 # Main Application Runner
 def main():
-    gemini_api_key = os.getenv("GEMINI_API_KEY")
+    parser = argparse.ArgumentParser(description="Greeting agent")
+    subparsers = parser.add_subparsers(dest="command")
+    batch = subparsers.add_parser("batch", help='Answer every {"id", "prompt"} line of a JSONL file')
+    batch.add_argument("input", help="JSONL file of prompts")
+    batch.add_argument("-o", "--output", default="results.jsonl", help="JSONL file for the answers")
+    batch.add_argument("--concurrency", type=int, default=16, help="Requests in flight at once")
+    batch.add_argument("--rate", type=float, default=10.0, help="Model calls per second")
+    batch.add_argument("--retries", type=int, default=3, help="Retries for transient API errors")
+    batch.add_argument("--metrics", help="Also write model call metrics to this file (Prometheus text format)")
+    args = parser.parse_args()
 
-    model_provider = ModelProvider(gemini_api_key)
+    # Model setup (endpoint, pooled client, metrics) lives in agent_common.model_provider
+    model_provider = ModelProvider.shared()
     model = model_provider.get_model()
 
-    app = GreetingAgentApp(model)
+    app = GreetingAgentApp(
+        model,
+        use_local_intents=os.getenv("AGENT_LOCAL_INTENTS", "1") == "1",
+        cache_path=os.getenv("RESPONSE_CACHE_DB"),
+    )
+
+    if args.command == "batch":
+        runner = BatchRunner(app, args.concurrency, args.rate, RetryPolicy(attempts=args.retries + 1))
+        summary = asyncio.run(runner.run(args.input, args.output))
+        summary["model_calls_by_name"] = model_provider.metrics.snapshot()
+        print(json.dumps(summary, indent=2))
+        if args.metrics:
+            with open(args.metrics, "w", encoding="utf-8") as file:
+                file.write(model_provider.metrics.to_prometheus())
+        return
 
     user_question = input("Please enter your question: ")
     response = app.get_response(user_question)
@@ -1,105 +1,803 @@
-import click
-import json
 import os
+import stat
+import sys
+
+# 👇 Fast path: when a resident daemon is running (see the "daemon" command), hand it the
+# command before importing anything else, so repeated calls skip click's import cost entirely
+STARTUP_BUDGET_MS = 150
+NO_FORWARD = {"daemon", "batch", "startup-benchmark", "-"}
+
+# The socket lives in a directory only this user can enter ($XDG_RUNTIME_DIR, or a 0700
+# directory under /tmp), so another local user can't plant a socket there first
+def socket_dir():
+    return os.environ.get("XDG_RUNTIME_DIR") or os.path.join("/tmp", f"todo-{os.getuid()}")
+
+def socket_path():
+    default = os.path.join(socket_dir(), "todo.sock") if hasattr(os, "getuid") else ""
+    return os.environ.get("TODO_SOCKET", default)
+
+# Only talk to a socket this user created; anything else is ignored rather than trusted
+def owned_socket(path):
+    try:
+        info = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(info.st_mode) and info.st_uid == os.getuid()
+
+def forward_to_daemon(argv):
+    path = socket_path()
+    if os.environ.get("TODO_NO_DAEMON") or not path or not owned_socket(path) or NO_FORWARD & set(argv):
+        return None
+    import socket
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.connect(path)
+            conn.sendall("\0".join([os.getcwd(), *argv]).encode())
+            conn.shutdown(socket.SHUT_WR)
+            reply = b"".join(iter(lambda: conn.recv(65536), b""))
+    except OSError:
+        return None  # Stale socket or daemon gone: run the command here instead
+    code, out, err = reply.decode().split("\0", 2)
+    sys.stdout.write(out)
+    sys.stderr.write(err)
+    return int(code)
+
+if __name__ == "__main__":
+    exit_code = forward_to_daemon(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+
+import bisect
+import heapq
+import json
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl  # File locking is available on Unix-like systems
+except ImportError:
+    fcntl = None
+
+# 👇 OOP Concept: Encapsulation
+# All the details of how tasks are stored on disk live inside this class:
+# a compacted snapshot (todo.json) plus an append-only log of operations (todo.json.log)
+class TaskStore:
+    def __init__(self, file_name="todo.json", compact_bytes=256 * 1024):
+        self.file_name = file_name
+        self.log_name = file_name + ".log"
+        # The lock file also holds the next task ID and running counters,
+        # so adding a task or showing stats never reads the whole list
+        self.lock_name = file_name + ".lock"
+        # Secondary indexes over the snapshot, rewritten whenever it is compacted
+        self.index_name = file_name + ".idx"
+        self.compact_bytes = compact_bytes  # Fold the log into the snapshot once it grows past this
+
+    # 👇 OOP Concept: Abstraction
+    # Every read and write happens while holding a lock, so parallel runs can't clobber each other
+    @contextmanager
+    def _locked(self, exclusive=True):
+        with open(self.lock_name, "a+") as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield lock
+            finally:
+                if fcntl:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _read_snapshot(self):
+        if not os.path.exists(self.file_name):
+            return {}, 1
+        try:
+            with open(self.file_name, "r") as file:
+                data = json.load(file)
+        except json.JSONDecodeError:
+            return {}, 1
+        if isinstance(data, list):
+            # Old format: a plain list, so IDs are the original positions
+            tasks = {index: task for index, task in enumerate(data, start=1)}
+            return tasks, len(data) + 1
+        tasks = {task["id"]: {key: value for key, value in task.items() if key != "id"} for task in data["tasks"]}
+        return tasks, data["next_id"]
+
+    # Applying an operation is idempotent, so a log that outlived its compaction is harmless
+    @staticmethod
+    def _apply(tasks, op):
+        if op["op"] == "add" and op["id"] not in tasks:
+            tasks[op["id"]] = {"task": op["task"], "done": False}
+            tasks[op["id"]].update({field: op[field] for field in TASK_FIELDS if field in op})
+        elif op["op"] == "complete" and op["id"] in tasks:
+            tasks[op["id"]]["done"] = True
+        elif op["op"] == "delete":
+            tasks.pop(op["id"], None)
+
+    def _replay(self, tasks, next_id):
+        if not os.path.exists(self.log_name):
+            return tasks, next_id
+        with open(self.log_name, "r") as log:
+            for line in log:
+                try:
+                    op = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # A half-written last line from an interrupted run
+                self._apply(tasks, op)
+                if op["op"] == "add":
+                    next_id = max(next_id, op["id"] + 1)
+        return tasks, next_id
+
+    def _load(self):
+        return self._replay(*self._read_snapshot())
+
+    def _append(self, ops):
+        with open(self.log_name, "a") as log:
+            log.write("".join(json.dumps(op) + "\n" for op in ops))
+
+    # Running totals kept next to the next ID; step is +1 when a task appears and -1 when it goes
+    @staticmethod
+    def _count(meta, task, step):
+        meta["total"] += step
+        if task["done"]:
+            meta["done"] += step
+        for tag in task.get("tags", []):
+            meta["tags"][tag] = meta["tags"].get(tag, 0) + step
+            if meta["tags"][tag] <= 0:
+                del meta["tags"][tag]
+
+    def _build_meta(self, tasks, next_id):
+        meta = {"next_id": next_id, "total": 0, "done": 0, "tags": {}}
+        for task in tasks.values():
+            self._count(meta, task, 1)
+        return meta
+
+    def _read_meta(self, lock):
+        lock.seek(0)
+        stored = lock.read().strip()
+        try:
+            meta = json.loads(stored) if stored else None
+        except json.JSONDecodeError:
+            meta = None
+        if isinstance(meta, dict):
+            return meta
+        # Missing, or the older plain next-ID format: rebuild the counters once
+        tasks, next_id = self._load()
+        return self._build_meta(tasks, max(next_id, meta if isinstance(meta, int) else 0))
+
+    def _write_meta(self, lock, meta):
+        lock.seek(0)
+        lock.truncate()
+        lock.write(json.dumps(meta))
+        lock.flush()
+
+    def _maybe_compact(self, lock):
+        if os.path.exists(self.log_name) and os.path.getsize(self.log_name) > self.compact_bytes:
+            self._compact(lock)
+
+    def _compact(self, lock):
+        tasks, next_id = self._load()
+        # Still one JSON document, but with one task per line so the index can point at each task
+        # (json.dumps escapes non-ASCII text, so string lengths are byte offsets)
+        header = f'{{"next_id": {next_id}, "tasks": [\n'
+        lines = [json.dumps({"id": task_id, **task}) for task_id, task in tasks.items()]
+        offsets = [len(header)]
+        for line in lines:
+            offsets.append(offsets[-1] + len(line) + 2)
+        temp_name = self.file_name + ".tmp"
+        with open(temp_name, "w", newline="\n") as file:
+            file.write(header + ",\n".join(lines) + "\n]}\n")
+        os.replace(temp_name, self.file_name)
+        open(self.log_name, "w").close()
+        self._write_meta(lock, self._build_meta(tasks, next_id))
+        # Written last: if a run dies before this, the old index's stamp no longer matches
+        index = TaskIndex.build(self.file_name, tasks, offsets)
+        with open(temp_name, "w") as file:
+            file.write(index.dumps(self._stamp()))
+        os.replace(temp_name, self.index_name)
+        return index
+
+    # Size and modification time of the snapshot, so an index built from another snapshot is ignored
+    def _stamp(self):
+        info = os.stat(self.file_name)
+        return [info.st_size, info.st_mtime_ns]
+
+    def _read_index(self):
+        try:
+            with open(self.index_name, "r") as file:
+                sections = dict(line.rstrip("\n").split(" ", 1) for line in file)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(self.file_name) or sections.pop("snapshot", None) != json.dumps(self._stamp()):
+            return None
+        if any(name not in sections for name in TaskIndex.SECTIONS):
+            return None
+        index = TaskIndex(self.file_name, sections)
+        # Operations since the last compaction are only in the log, which stays short
+        if os.path.exists(self.log_name):
+            with open(self.log_name, "rb") as log:
+                offset = 0
+                for line in log:
+                    try:
+                        index.apply(json.loads(line), (self.log_name, offset, len(line)))
+                    except json.JSONDecodeError:
+                        pass  # A half-written last line from an interrupted run
+                    offset += len(line)
+        return index
+
+    # Read just the records for these IDs, seeking straight to each one
+    def _read_tasks(self, index, task_ids):
+        files, tasks = {}, []
+        try:
+            for task_id in task_ids:
+                name, offset, length = index.span(task_id)
+                if name not in files:
+                    files[name] = open(name, "rb")
+                files[name].seek(offset)
+                record = json.loads(files[name].read(length))
+                task = {"id": task_id, "task": record["task"], "done": task_id not in index.pending()}
+                task.update({field: record[field] for field in TASK_FIELDS if field in record})
+                tasks.append(task)
+        finally:
+            for file in files.values():
+                file.close()
+        return tasks
+
+    # Group many operations under one lock and write them with a single append;
+    # if anything fails inside the block, nothing is written
+    @contextmanager
+    def batch(self):
+        with self._locked() as lock:
+            batch = TaskBatch(self, lock)
+            yield batch
+            batch.commit()
+
+    def load(self):
+        with self._locked(exclusive=False):
+            tasks, _ = self._load()
+        return [{"id": task_id, **task} for task_id, task in tasks.items()]
+
+    def stats(self):
+        with self._locked(exclusive=False) as lock:
+            return self._read_meta(lock)
+
+    # Filter, sort and page using the index; returns (tasks on this page, number of matches)
+    def query(self, pending=None, tag=None, due_before=None, sort="id", page=1, per_page=50):
+        with self._locked(exclusive=False):
+            index = self._read_index()
+            if index is not None:
+                return self._query(index, pending, tag, due_before, sort, page, per_page)
+        # No usable index yet (older files, or an interrupted compaction): compacting builds one
+        with self._locked() as lock:
+            index = self._read_index() or self._compact(lock)
+            return self._query(index, pending, tag, due_before, sort, page, per_page)
+
+    def _query(self, index, pending, tag, due_before, sort, page, per_page):
+        matches = index.query(pending, tag, due_before, sort)
+        start = (page - 1) * per_page
+        return self._read_tasks(index, matches[start:start + per_page]), len(matches)
+
+    def add(self, text, **fields):
+        with self.batch() as batch:
+            return batch.add(text, **fields)
+
+    def complete(self, task_id):
+        with self.batch() as batch:
+            return batch.complete(task_id)
+
+    def delete(self, task_id):
+        with self.batch() as batch:
+            return batch.delete(task_id)
+
+    def compact(self):
+        with self._locked() as lock:
+            self._compact(lock)
+
+# 👇 OOP Concept: Encapsulation
+# A batch buffers operations in memory and only reads the task list if it has to
+class TaskBatch:
+    def __init__(self, store, lock):
+        self._store = store
+        self._lock = lock
+        self._ops = []
+        self._tasks = None    # Loaded on first use; adding alone never needs it
+        self._meta = None
+
+    def tasks(self):
+        if self._tasks is None:
+            self._tasks, _ = self._store._load()
+            for op in self._ops:
+                self._store._apply(self._tasks, op)
+        return self._tasks
+
+    def meta(self):
+        if self._meta is None:
+            self._meta = self._store._read_meta(self._lock)
+        return self._meta
+
+    def _record(self, op):
+        self._ops.append(op)
+        if self._tasks is not None:
+            self._store._apply(self._tasks, op)
+
+    def add(self, text, **fields):
+        meta = self.meta()
+        task_id = meta["next_id"]
+        meta["next_id"] += 1
+        fields = {field: value for field, value in fields.items() if value}
+        op = {"op": "add", "id": task_id, "task": text, "created": datetime.now().isoformat(timespec="seconds"), **fields}
+        self._record(op)
+        self._store._count(meta, {"done": False, **fields}, 1)
+        return task_id
+
+    def complete(self, task_id):
+        task = self.tasks().get(task_id)
+        if task is None:
+            return False
+        if not task["done"]:
+            self.meta()["done"] += 1
+        self._record({"op": "complete", "id": task_id})
+        return True
+
+    def delete(self, task_id):
+        task = self.tasks().get(task_id)
+        if task is None:
+            return None
+        self._store._count(self.meta(), task, -1)
+        self._record({"op": "delete", "id": task_id})
+        return task["task"]
+
+    def commit(self):
+        if self._ops:
+            self._store._append(self._ops)
+        if self._meta is not None:
+            self._store._write_meta(self._lock, self._meta)
+        self._store._maybe_compact(self._lock)
+
+# Optional fields a task can carry besides its text and done flag
+TASK_FIELDS = ("created", "due", "tags", "priority")
+PRIORITIES = {"high": 0, "medium": 1, "low": 2}
+SORT_KEYS = {
+    "id": lambda task: task["id"],
+    "due": lambda task: (task.get("due") or "9999-99-99", task["id"]),
+    "priority": lambda task: (PRIORITIES.get(task.get("priority"), len(PRIORITIES)), task["id"]),
+    "created": lambda task: (task.get("created") or "", task["id"]),
+}
+
+# 👇 OOP Concept: Encapsulation
+# Secondary indexes over the snapshot: pending IDs, IDs per tag and the IDs presorted by
+# each sort key. Each section is one line of JSON, decoded only when a query needs it;
+# operations logged since the last compaction are kept on the side and merged in
+class TaskIndex:
+    ORDERS = [name for name in SORT_KEYS if name != "id"]
+    SECTIONS = ["ids", "offsets", "pending", "tags", *ORDERS]
+
+    def __init__(self, file_name, sections):
+        self.file_name = file_name
+        self._sections = sections  # Section name -> JSON text
+        self._decoded = {}
+        self._id_set = None
+        self._positions = None
+        self._pending = None
+        self.added = {}  # ID -> (span, task) for tasks added since the last compaction
+        self.completed = set()
+        self.deleted = set()
+
+    # offsets[i] is where task i's line starts in the snapshot; each line ends with ",\n"
+    @classmethod
+    def build(cls, file_name, tasks, offsets):
+        tags = defaultdict(list)
+        for task_id, task in tasks.items():
+            for tag in task.get("tags", []):
+                tags[tag].append(task_id)
+        sections = {
+            "ids": list(tasks),
+            "offsets": offsets,
+            "pending": [task_id for task_id, task in tasks.items() if not task["done"]],
+            "tags": tags,
+        }
+        for name in cls.ORDERS:
+            pairs = sorted(SORT_KEYS[name]({"id": task_id, **task}) for task_id, task in tasks.items())
+            sections[name] = [[key for key, _ in pairs], [task_id for _, task_id in pairs]]
+        return cls(file_name, {name: json.dumps(value) for name, value in sections.items()})
+
+    def dumps(self, stamp):
+        sections = {"snapshot": json.dumps(stamp), **self._sections}
+        return "".join(f"{name} {text}\n" for name, text in sections.items())
+
+    def _section(self, name):
+        if name not in self._decoded:
+            self._decoded[name] = json.loads(self._sections[name])
+        return self._decoded[name]
+
+    def _ids(self):
+        if self._id_set is None:
+            self._id_set = set(self._section("ids"))
+        return self._id_set
+
+    # Same rules as TaskStore._apply
+    def apply(self, op, span):
+        if op["op"] == "add" and op["id"] not in self.added and op["id"] not in self._ids():
+            self.added[op["id"]] = (span, {field: op[field] for field in TASK_FIELDS if field in op})
+        elif op["op"] == "complete":
+            self.completed.add(op["id"])
+        elif op["op"] == "delete":
+            self.deleted.add(op["id"])
+
+    def pending(self):
+        if self._pending is None:
+            self._pending = (set(self._section("pending")) | self.added.keys()) - self.completed
+        return self._pending
+
+    def span(self, task_id):
+        if task_id in self.added:
+            return self.added[task_id][0]
+        if self._positions is None:
+            self._positions = {task_id: position for position, task_id in enumerate(self._section("ids"))}
+        offsets = self._section("offsets")
+        position = self._positions[task_id]
+        return self.file_name, offsets[position], offsets[position + 1] - offsets[position] - 2
+
+    def query(self, pending=None, tag=None, due_before=None, sort="id"):
+        candidates = (self._ids() | self.added.keys()) - self.deleted
+        if pending is not None:
+            candidates = candidates & self.pending() if pending else candidates - self.pending()
+        if tag:
+            tagged = set(self._section("tags").get(tag, []))
+            tagged.update(task_id for task_id, (_, task) in self.added.items() if tag in task.get("tags", []))
+            candidates &= tagged
+        if due_before:
+            # Keys are sorted, and tasks without a due date sort as "9999-99-99", after any real date
+            keys, task_ids = self._section("due")
+            due = set(task_ids[:bisect.bisect_left(keys, due_before)])
+            due.update(task_id for task_id, (_, task) in self.added.items()
+                       if task.get("due") and task["due"] < due_before)
+            candidates &= due
+        if sort == "id":
+            return sorted(candidates)
+        keys, task_ids = self._section(sort)
+        ordered = ((key, task_id) for key, task_id in zip(keys, task_ids) if task_id in candidates)
+        added = sorted(SORT_KEYS[sort]({"id": task_id, **task})
+                       for task_id, (_, task) in self.added.items() if task_id in candidates)
+        return [task_id for _, task_id in heapq.merge(ordered, added)]
+
+# Turn arguments like ("3", "5-8") into task IDs [3, 5, 6, 7, 8]
+def parse_task_ids(specs):
+    task_ids = []
+    for spec in specs:
+        try:
+            if "-" in spec:
+                first, last = (int(part) for part in spec.split("-", 1))
+                task_ids.extend(range(first, last + 1))
+            else:
+                task_ids.append(int(spec))
+        except ValueError:
+            raise ValueError(f"'{spec}' is not a task ID or range like 3-7")
+    return task_ids
 
 # 👇 OOP Concept: Encapsulation
 # All the logic for managing tasks is inside this class
 class TodoManager:
     def __init__(self, file_name="todo.json"):
-        self.file_name = file_name  # Save file name for storing tasks
+        self.store = TaskStore(file_name)  # Storage engine for tasks
 
-    # 👇 OOP Concept: Abstraction
-    # This method hides the details of reading from a file
-    def load_tasks(self):
-        if os.path.exists(self.file_name):
-            try:
-                with open(self.file_name, "r") as file:
-                    return json.load(file)  # Load task list
-            except json.JSONDecodeError:
-                return []
-        return []
-
-    # This method hides the details of saving to a file
-    def save_tasks(self, tasks):
-        with open(self.file_name, "w") as file:
-            json.dump(tasks, file, indent=4)
-
-    # Add a new task
-    def add_task(self, task):
-        tasks = self.load_tasks()
-        tasks.append({"task": task, "done": False})  # Add new task with "not done" status
-        self.save_tasks(tasks)
-        return task
+    # Add a new task and return its ID
+    def add_task(self, task, due=None, tags=(), priority=None):
+        return self.store.add(task, due=due, tags=list(tags), priority=priority)
+
+    # Add many tasks in one write and return their IDs
+    def add_tasks(self, texts, due=None, tags=(), priority=None):
+        with self.store.batch() as batch:
+            return [batch.add(text, due=due, tags=list(tags), priority=priority) for text in texts]
 
     # Show all tasks
     def list_tasks(self):
-        return self.load_tasks()
+        return self.store.load()
+
+    # Filter, sort and page through tasks; returns (tasks on this page, number of matches)
+    # Answered from the persisted indexes, so only the tasks on the page are read
+    def query_tasks(self, pending=None, tag=None, due_before=None, sort="id", page=1, per_page=50):
+        return self.store.query(pending, tag, due_before, sort, page, per_page)
+
+    # Counters kept up to date on every change, so this never reads the task list
+    def stats(self):
+        return self.store.stats()
 
     # Mark a task as completed
-    def complete_task(self, task_number):
-        tasks = self.load_tasks()
-        if 0 < task_number <= len(tasks):
-            tasks[task_number - 1]["done"] = True
-            self.save_tasks(tasks)
-            return True
-        return False
+    def complete_task(self, task_id):
+        return self.store.complete(task_id)
 
     # Delete a task
-    def delete_task(self, task_number):
-        tasks = self.load_tasks()
-        if 0 < task_number <= len(tasks):
-            removed_task = tasks.pop(task_number - 1)
-            self.save_tasks(tasks)
-            return removed_task["task"]
-        return None
+    def delete_task(self, task_id):
+        return self.store.delete(task_id)
+
+    # Pick tasks by ID and/or filters (text contained in the task, done status)
+    @staticmethod
+    def select(tasks, task_ids=(), match=None, done=None):
+        chosen = [task_id for task_id in task_ids if task_id in tasks] if task_ids else list(tasks)
+        if match:
+            chosen = [task_id for task_id in chosen if match.casefold() in tasks[task_id]["task"].casefold()]
+        if done is not None:
+            chosen = [task_id for task_id in chosen if tasks[task_id]["done"] == done]
+        return chosen
+
+    # Complete every selected task and return their IDs
+    def complete_tasks(self, task_ids=(), match=None):
+        with self.store.batch() as batch:
+            chosen = self.select(batch.tasks(), task_ids, match, done=False)
+            for task_id in chosen:
+                batch.complete(task_id)
+        return chosen
+
+    # Delete every selected task and return their names
+    def delete_tasks(self, task_ids=(), match=None, done=None):
+        with self.store.batch() as batch:
+            chosen = self.select(batch.tasks(), task_ids, match, done)
+            return [batch.delete(task_id) for task_id in chosen]
+
+    # Run "add <text>", "complete <ids>" and "delete <ids>" lines in one locked load/save cycle
+    def run_batch(self, lines):
+        counts = {"add": 0, "complete": 0, "delete": 0, "skipped": 0}
+        with self.store.batch() as batch:
+            for line in lines:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                command, _, rest = line.partition(" ")
+                if command == "add" and rest.strip():
+                    batch.add(rest.strip())
+                    counts["add"] += 1
+                elif command in ("complete", "delete"):
+                    action = batch.complete if command == "complete" else batch.delete
+                    for task_id in parse_task_ids(rest.split()):
+                        if action(task_id):
+                            counts[command] += 1
+                        else:
+                            counts["skipped"] += 1
+                else:
+                    counts["skipped"] += 1
+        return counts
+
+# One shared TodoManager, created the first time a command needs it rather than at import time
+_manager = None
+
+def get_manager():
+    global _manager
+    if _manager is None:
+        _manager = TodoManager()
+    return _manager
 
 # CLI (Command Line Interface) starts here
-@click.group()
-def cli():
-    """Simple Todo List Manager"""
-    pass
-
-# Create an object of TodoManager
-manager = TodoManager()
-
-@cli.command()
-@click.argument("task")
-def add(task):
-    """Add a new task to the list"""
-    manager.add_task(task)
-    click.echo(f"✅ Task added: {task}")
-
-@cli.command(name="list")
-def list_tasks():
-    """List all tasks"""
-    tasks = manager.list_tasks()
-    if not tasks:
-        click.echo("📭 No Task Found")
-        return
-    for index, task in enumerate(tasks):
-        status = "✅ Done" if task["done"] else "⏳ Not Done"
-        click.echo(f"{index + 1}. {task['task']} - {status}")
-
-@cli.command()
-@click.argument("task_number", type=int)
-def complete(task_number):
-    """Mark a task as complete"""
-    success = manager.complete_task(task_number)
-    if success:
-        click.echo(f"✅ Task {task_number} marked as completed")
-    else:
-        click.echo("❌ Invalid Task Number")
-
-@cli.command()
-@click.argument("task_number", type=int)
-def delete(task_number):
-    """Delete a task"""
-    removed = manager.delete_task(task_number)
-    if removed:
-        click.echo(f"🗑️ Task '{removed}' deleted")
-    else:
-        click.echo("❌ Invalid Task Number")
+# click is only imported when a command actually has to run in this process
+def build_cli():
+    import click
+
+    def task_ids_option(specs):
+        try:
+            return parse_task_ids(specs)
+        except ValueError as error:
+            raise click.BadParameter(str(error))
+
+    @click.group()
+    def cli():
+        """Simple Todo List Manager"""
+        pass
+
+    @cli.command()
+    @click.argument("task", required=False)
+    @click.option("--from-file", type=click.File("r"), help="Add one task per line from a file ('-' for stdin)")
+    @click.option("--due", type=click.DateTime(formats=["%Y-%m-%d"]), help="Due date (YYYY-MM-DD)")
+    @click.option("--tag", "tags", multiple=True, help="Tag the task (repeatable)")
+    @click.option("--priority", type=click.Choice(list(PRIORITIES)), help="Task priority")
+    def add(task, from_file, due, tags, priority):
+        """Add a new task to the list"""
+        due = due.date().isoformat() if due else None
+        if from_file:
+            texts = [line.strip() for line in from_file if line.strip()]
+            task_ids = get_manager().add_tasks(texts, due, tags, priority)
+            click.echo(f"✅ {len(task_ids)} tasks added")
+        elif task:
+            task_id = get_manager().add_task(task, due, tags, priority)
+            click.echo(f"✅ Task {task_id} added: {task}")
+        else:
+            raise click.UsageError("Give a TASK or --from-file")
+
+    @cli.command(name="list")
+    @click.option("--pending/--done", default=None, help="Only pending or only completed tasks")
+    @click.option("--tag", help="Only tasks with this tag")
+    @click.option("--due-before", type=click.DateTime(formats=["%Y-%m-%d"]), help="Only tasks due before this date")
+    @click.option("--sort", type=click.Choice(list(SORT_KEYS)), default="id", help="Sort order")
+    @click.option("--page", type=click.IntRange(min=1), default=1, help="Page to show")
+    @click.option("--per-page", type=click.IntRange(min=1), default=50, help="Tasks per page")
+    def list_tasks(pending, tag, due_before, sort, page, per_page):
+        """List tasks"""
+        due_before = due_before.date().isoformat() if due_before else None
+        tasks, total = get_manager().query_tasks(pending, tag, due_before, sort, page, per_page)
+        if not tasks:
+            click.echo("📭 No Task Found")
+            return
+        for task in tasks:
+            status = "✅ Done" if task["done"] else "⏳ Not Done"
+            extras = "".join([
+                f" [{task['priority']}]" if task.get("priority") else "",
+                f" (due {task['due']})" if task.get("due") else "",
+                "".join(f" #{tag}" for tag in task.get("tags", []))
+            ])
+            click.echo(f"{task['id']}. {task['task']} - {status}{extras}")
+        pages = -(-total // per_page)
+        if pages > 1:
+            click.echo(f"-- page {page} of {pages} ({total} tasks), use --page to see more --")
+
+    @cli.command()
+    def stats():
+        """Show task counts"""
+        counts = get_manager().stats()
+        pending = counts["total"] - counts["done"]
+        click.echo(f"📋 Total: {counts['total']}  ✅ Done: {counts['done']}  ⏳ Pending: {pending}")
+        if counts["tags"]:
+            tags = sorted(counts["tags"].items(), key=lambda item: -item[1])
+            click.echo("🏷️ " + ", ".join(f"#{tag}: {count}" for tag, count in tags))
+
+    @cli.command()
+    @click.argument("task_ids", nargs=-1)
+    @click.option("--match", help="Only tasks whose text contains this")
+    def complete(task_ids, match):
+        """Mark tasks as complete (IDs or ranges like 3-7)"""
+        if not task_ids and not match:
+            raise click.UsageError("Give task IDs or --match")
+        if len(task_ids) == 1 and "-" not in task_ids[0] and not match:
+            task_id = task_ids_option(task_ids)[0]
+            if get_manager().complete_task(task_id):
+                click.echo(f"✅ Task {task_id} marked as completed")
+            else:
+                click.echo("❌ Invalid Task ID")
+            return
+        completed = get_manager().complete_tasks(task_ids_option(task_ids), match)
+        click.echo(f"✅ {len(completed)} tasks marked as completed")
+
+    @cli.command()
+    @click.argument("task_ids", nargs=-1)
+    @click.option("--match", help="Only tasks whose text contains this")
+    @click.option("--done", is_flag=True, help="Only completed tasks")
+    def delete(task_ids, match, done):
+        """Delete tasks (IDs or ranges like 3-7)"""
+        if not task_ids and not match and not done:
+            raise click.UsageError("Give task IDs, --match or --done")
+        if len(task_ids) == 1 and "-" not in task_ids[0] and not match and not done:
+            removed = get_manager().delete_task(task_ids_option(task_ids)[0])
+            if removed:
+                click.echo(f"🗑️ Task '{removed}' deleted")
+            else:
+                click.echo("❌ Invalid Task ID")
+            return
+        removed = get_manager().delete_tasks(task_ids_option(task_ids), match, True if done else None)
+        click.echo(f"🗑️ {len(removed)} tasks deleted")
+
+    @cli.command()
+    @click.argument("source", type=click.File("r"), default="-")
+    def batch(source):
+        """Read add/complete/delete commands (stdin by default) and apply them in one go"""
+        try:
+            counts = get_manager().run_batch(source)
+        except ValueError as error:
+            raise click.ClickException(f"{error}; nothing was applied")
+        click.echo(
+            f"✅ {counts['add']} added, {counts['complete']} completed, "
+            f"{counts['delete']} deleted, {counts['skipped']} skipped"
+        )
+
+    @cli.command()
+    def compact():
+        """Fold the operation log into the task file"""
+        get_manager().store.compact()
+        click.echo("🧹 Task file compacted")
+
+    @cli.command()
+    def daemon():
+        """Keep the CLI loaded and serve commands over a Unix socket"""
+        path = socket_path()
+        try:
+            if "TODO_SOCKET" not in os.environ:
+                make_private_dir(socket_dir())
+            click.echo(f"🚀 Serving todo commands on {path} (Ctrl+C to stop)")
+            serve(cli, path)
+        except PermissionError as error:
+            raise click.ClickException(str(error))
+
+    @cli.command(name="startup-benchmark")
+    @click.option("--runs", type=click.IntRange(min=1), default=10, help="Launches to time per mode")
+    @click.option("--budget-ms", type=int, default=STARTUP_BUDGET_MS, help="Allowed median time for one command")
+    def startup_benchmark(runs, budget_ms):
+        """Time how long a command takes from launch to exit"""
+        import statistics
+        import subprocess
+        import time
+
+        def median_ms(command, env):
+            timings = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                subprocess.run(command, env=env, stdout=subprocess.DEVNULL, check=False)
+                timings.append((time.perf_counter() - start) * 1000)
+            return statistics.median(timings)
+
+        direct_env = {**os.environ, "TODO_NO_DAEMON": "1"}
+        results = {
+            "bare interpreter": median_ms([sys.executable, "-c", "pass"], direct_env),
+            "stats (direct)": median_ms([sys.executable, __file__, "stats"], direct_env),
+        }
+        if owned_socket(socket_path()):
+            results["stats (via daemon)"] = median_ms([sys.executable, __file__, "stats"], os.environ)
+        for mode, elapsed in results.items():
+            click.echo(f"⏱️ {mode}: {elapsed:.1f} ms")
+        best = min(elapsed for mode, elapsed in results.items() if mode != "bare interpreter")
+        if best > budget_ms:
+            raise click.ClickException(f"Startup {best:.1f} ms is over the {budget_ms} ms budget")
+        click.echo(f"✅ Within the {budget_ms} ms budget")
+
+    return cli
+
+
+# 👇 OOP Concept: Abstraction
+# The daemon runs each forwarded command in-process and sends back its output and exit code
+def run_command(cli, cwd, argv):
+    import click
+    import io
+    import traceback
+    from contextlib import redirect_stderr, redirect_stdout
+
+    out, err = io.StringIO(), io.StringIO()
+    code = 0
+    with redirect_stdout(out), redirect_stderr(err):
+        try:
+            os.chdir(cwd)
+            cli.main(args=argv, prog_name="main.py", standalone_mode=False)
+        except click.exceptions.Exit as error:
+            code = error.exit_code
+        except click.ClickException as error:
+            error.show()
+            code = error.exit_code
+        except click.Abort:
+            code = 1
+        except Exception:
+            traceback.print_exc()
+            code = 1
+    return code, out.getvalue(), err.getvalue()
+
+# Create the socket directory, refusing one that is someone else's or that others can write to
+def make_private_dir(path):
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(f"{path} must be a directory that only you can access")
+
+def serve(cli, path):
+    import signal
+    import socket
+
+    # Turn SIGTERM into a normal exit so the socket file is cleaned up
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    if os.path.lexists(path):
+        if not owned_socket(path):
+            raise PermissionError(f"{path} exists and is not a socket you own")
+        os.unlink(path)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        # The socket is created 0600 by bind itself; a chmod afterwards would leave a window
+        old_umask = os.umask(0o177)
+        try:
+            server.bind(path)
+        finally:
+            os.umask(old_umask)
+        server.listen()
+        try:
+            while True:
+                conn, _ = server.accept()
+                with conn:
+                    request = b"".join(iter(lambda: conn.recv(65536), b"")).decode()
+                    cwd, *argv = request.split("\0")
+                    code, out, err = run_command(cli, cwd, argv)
+                    conn.sendall(f"{code}\0{out}\0{err}".encode())
+        finally:
+            os.unlink(path)
 
 # Start the CLI application
 if __name__ == "__main__":
-    cli()
+    build_cli()()